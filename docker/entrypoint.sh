@@ -5,28 +5,17 @@ set -eu
 export TZ="${CC_TIMEZONE:-UTC}"
 echo "[*] Zeitzone gesetzt auf: $TZ"
 
-echo "[*] Prüfe Playwright-Browserinstallation"
-if ! playwright show-browsers 2>/dev/null | grep -q chromium; then
+# Günstiger Dateisystem-Check statt "playwright show-browsers" (startet Node)
+BROWSERS_DIR="${PLAYWRIGHT_BROWSERS_PATH:-$HOME/.cache/ms-playwright}"
+if ! ls -d "$BROWSERS_DIR"/chromium* >/dev/null 2>&1; then
+  echo "[*] Installiere Playwright-Chromium"
   playwright install chromium
 fi
 
-echo "[*] Führe initialen Testlauf aus"
-echo "[*] Teste Login-Funktionalität..."
-if python -m src.cli \
-  --username "${CC_USERNAME:?Umgebungsvariable CC_USERNAME fehlt}" \
-  --password "${CC_PASSWORD:?Umgebungsvariable CC_PASSWORD fehlt}" \
-  --bot-token "${CC_BOT_TOKEN:?Umgebungsvariable CC_BOT_TOKEN fehlt}" \
-  --chat-id "${CC_CHAT_ID:?Umgebungsvariable CC_CHAT_ID fehlt}" \
-  --host "${CC_HOSTNAME:?Umgebungsvariable CC_HOSTNAME fehlt}" \
-  --mode test; then
-  echo "[✓] Login-Test erfolgreich - Bot ist bereit!"
-else
-  echo "[✗] Login-Test fehlgeschlagen - Bot wird trotzdem gestartet" >&2
-  echo "[!] Bitte überprüfe deine Credentials und Hostname-Einstellungen" >&2
-fi
-
-echo "[*] Initialisiere Cronjob-Datei"
-python -m src.scheduler \
+echo "[*] Initialisiere Cronjob-Datei (Login-Selbsttest läuft im Hintergrund)"
+exec python -m src.scheduler \
+  --boot \
+  --workdir "$(pwd)" \
   --cron-file /etc/cron.d/cc-bot \
   --username "${CC_USERNAME:?Umgebungsvariable CC_USERNAME fehlt}" \
   --password "${CC_PASSWORD:?Umgebungsvariable CC_PASSWORD fehlt}" \
@@ -37,5 +26,12 @@ python -m src.scheduler \
   ${CC_END_TIME:+--end-time "$CC_END_TIME"} \
   ${CC_VARIATION_MINUTES:+--variation-minutes "$CC_VARIATION_MINUTES"} \
   ${CC_TIMEZONE:+--timezone "$CC_TIMEZONE"} \
-  ${CC_DISABLE_VARIATION:+--disable-variation}
+  ${CC_LAUNCH_PROFILE:+--launch-profile "$CC_LAUNCH_PROFILE"} \
+  ${CC_DISABLE_VARIATION:+--disable-variation} \
+  ${CC_SKIP_SELF_TEST:+--no-self-test} \
+  ${CC_REPORT_POLICY:+--report-policy "$CC_REPORT_POLICY"} \
+  ${CC_DAILY_DIGEST:+--daily-digest} \
+  --health-port "${CC_HEALTH_PORT:-8080}" \
+  ${CC_HEALTH_HOST:+--health-host "$CC_HEALTH_HOST"} \
+  ${CC_HEALTH_FAIL_ON_LAST_RUN:+--health-fail-on-last-run}
 
@@ -62,11 +62,20 @@ import datetime as dt
 import logging
 import os
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
+
+from playwright.async_api import BrowserContext, Locator, Page, Response, async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-from playwright.async_api import BrowserContext, Locator, Page, async_playwright
+from .fixtures import FixtureRecorder, FixtureReplayer
+from .memory import RssSampler
+from .prewarm import ClickSchedule
+from .records import RunRecord, write_json
+from .retention import prune_bundles
+from .status_parser import parse_status
+from .tracing import NetworkTracer
 
 @dataclass(slots=True)
 class Credentials:
@@ -90,7 +99,25 @@ class RunConfig:
     headless: bool = True
     timeout: float = 30.0
     timezone: str = "UTC"
-
+    trace_network: bool = False
+    failure_dir: Optional[Path] = Path("artifacts/failures")
+    failure_keep: int = 10
+    failure_max_bytes: int = 100 * 1024 * 1024
+    launch_profile: str = "default"
+    record_dir: Optional[Path] = None
+    replay_dir: Optional[Path] = None
+    record_redact: list[str] = field(default_factory=list)
+    holiday_timeout: float = 20.0
+    action_at: Optional[dt.datetime] = None
+
+
+# Reihenfolge entspricht STATUS_SCOPES in src.status_parser
+STATUS_SELECTORS = [
+    "#zeiterfassungdetailscontainer p",
+    ".zeiterfassung p",
+    "#status p",
+    "p",
+]
 
 WINDOWS_EDGE_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -102,6 +129,48 @@ def _random_viewport() -> dict[str, int]:
     return {"width": 1920, "height": 1080}
 
 
+@dataclass(slots=True)
+class LaunchProfile:
+    args: list[str]
+    viewport: dict[str, int]
+    max_scale_factor: float
+
+
+LAUNCH_PROFILES: dict[str, LaunchProfile] = {
+    "default": LaunchProfile(args=[], viewport=_random_viewport(), max_scale_factor=1.4),
+    # Für speicherarme Container: kein GPU-Prozess, kleine Caches, keine Erweiterungen
+    "lean": LaunchProfile(
+        args=[
+            "--disable-gpu",
+            "--disable-software-rasterizer",
+            "--disable-dev-shm-usage",
+            "--disable-extensions",
+            "--disable-component-extensions-with-background-pages",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache",
+            "--disk-cache-size=8388608",
+            "--media-cache-size=1048576",
+            "--renderer-process-limit=1",
+            "--js-flags=--max-old-space-size=128",
+        ],
+        viewport={"width": 1280, "height": 800},
+        max_scale_factor=1.0,
+    ),
+}
+
+
+def _get_launch_profile(name: str) -> LaunchProfile:
+    try:
+        return LAUNCH_PROFILES[name]
+    except KeyError:
+        raise AutomationError(f"Unbekanntes Launch-Profil: {name}") from None
+
+
 async def _human_pause(min_ms: int = 160, max_ms: int = 420) -> None:
     await asyncio.sleep(random.uniform(min_ms, max_ms) / 1000)
 
@@ -172,6 +241,42 @@ class StatusError(AutomationError):
     """Fehler beim Auslesen oder Interpretieren des Status."""
 
 
+class FailureTrace:
+    """Playwright-Trace für Fehlerpakete, der die Eingabe der Zugangsdaten nicht enthält."""
+
+    def __init__(self, context: BrowserContext) -> None:
+        self._context = context
+        self.recording = False
+
+    async def start(self) -> None:
+        # Leichtgewichtig: DOM-Snapshots, kein Screencast, keine Quellen
+        await self._context.tracing.start(screenshots=False, snapshots=True, sources=False)
+        self.recording = True
+
+    @contextlib.asynccontextmanager
+    async def suspended(self) -> AsyncIterator[None]:
+        """Verwirft den bisherigen Trace und startet nach dem Block einen neuen.
+
+        stop_chunk() reicht nicht: das Netzwerk-Log überlebt Chunk-Grenzen und enthielte
+        den Login-POST samt Passwort. Tastatureingaben landen so ebenfalls nie im Trace.
+        """
+        if self.recording:
+            await self.discard()
+        yield
+        await self.start()
+
+    async def discard(self) -> None:
+        await self._context.tracing.stop()
+        self.recording = False
+
+    async def save(self, path: Path) -> bool:
+        """Speichert den laufenden Chunk; False, wenn der Fehler während der Login-Eingabe lag."""
+        recording = self.recording
+        await self._context.tracing.stop(path=path if recording else None)
+        self.recording = False
+        return recording
+
+
 def _require_base_url(host: str | None) -> str:
     if not host:
         raise LoginError(
@@ -180,46 +285,203 @@ def _require_base_url(host: str | None) -> str:
     return host
 
 
-async def run_bot(config: RunConfig) -> str:
+async def run_bot(config: RunConfig, record: Optional[RunRecord] = None) -> str:
     """Führt den Bot aus und gibt den berichteten Status zurück."""
 
     logging.debug("Starte Bot mit Modus %s", config.mode)
+    if record is None:
+        record = RunRecord(mode=config.mode, path=config.screenshot_path.with_suffix(".json"))
+    profile = _get_launch_profile(config.launch_profile)
+    sampler = RssSampler()
+    schedule = ClickSchedule(planned_at=config.action_at)
+    schedule.start()
     async with async_playwright() as playwright:
-        browser = await playwright.chromium.launch(headless=config.headless)
+        sampler.start()
+        with record.phase("launch"):
+            browser = await playwright.chromium.launch(headless=config.headless, args=profile.args)
+        tracer: Optional[NetworkTracer] = None
+        recorder: Optional[FixtureRecorder] = None
+        holiday_task: Optional[asyncio.Task] = None
+        context: Optional[BrowserContext] = None
+        page: Optional[Page] = None
+        trace: Optional[FailureTrace] = None
         try:
             context = await browser.new_context(
                 user_agent=WINDOWS_EDGE_UA,
-                viewport=_random_viewport(),
-                device_scale_factor=random.uniform(1.0, 1.4),
+                viewport=dict(profile.viewport),
+                device_scale_factor=random.uniform(1.0, profile.max_scale_factor),
             )
+            # Snapshot-Kosten fallen pro Aktion in login/time_tracking an, nicht in trace_start/-stop;
+            # das Flag erlaubt den Vergleich von Läufen mit und ohne Tracing
+            record.details["failure_trace"] = config.failure_dir is not None
+            if config.failure_dir is not None:
+                # Tracing nur für Fehlerfälle; bei Erfolg wird der Trace verworfen
+                trace = FailureTrace(context)
+                with record.phase("trace_start"):
+                    await trace.start()
+            if config.replay_dir is not None:
+                await FixtureReplayer(config.replay_dir).install(context)
             page = await context.new_page()
+            if config.record_dir is not None:
+                recorder = FixtureRecorder(
+                    config.record_dir,
+                    [config.credentials.username, config.credentials.password, *config.record_redact],
+                )
+                recorder.attach(page)
+            if config.trace_network:
+                tracer = NetworkTracer(
+                    {"login": LOGIN_PATH, "time": TIME_PATH, "course": holidays.COURSE_PATH}
+                )
+                tracer.attach(page)
             await _human_random_mouse_move(page)
             base_url = _require_base_url(config.base_url)
-            await login_portal(page, config.credentials, base_url, config.timeout)
-            status_text = await handle_time_tracking(page, config.mode, base_url, config.timeout)
+            with record.phase("login"):
+                await login_portal(page, config.credentials, base_url, config.timeout, trace)
+
+            # Feiertage bei Bedarf parallel zur Zeiterfassung auf einer zweiten Seite laden
+            cache_path = Path("artifacts/holidays_cache.json")
+            fetch_only = recorder is not None or config.replay_dir is not None
+            if fetch_only or holidays.should_refresh_holidays(cache_path):
+                holiday_page = await context.new_page()
+                for observer in (recorder, tracer):
+                    if observer is not None:
+                        observer.attach(holiday_page)
+                holiday_task = asyncio.create_task(
+                    _load_holidays(holiday_page, base_url, cache_path, config, record, fetch_only)
+                )
+
+            with record.phase("time_tracking"):
+                status_text = await handle_time_tracking(
+                    page, config.mode, base_url, config.timeout, recorder, schedule
+                )
+            expected_keyword = {"start": "Kommen", "stop": "Gehen"}.get(config.mode.lower())
+            if expected_keyword and expected_keyword not in status_text:
+                # Klick erfolgt, Bestätigung fehlt: kein Fehlerlauf, aber im Bericht kenntlich machen
+                record.details["status_unconfirmed"] = expected_keyword
+            if schedule.held_seconds:
+                # Wartezeit bis zur geplanten Klickzeit nicht als Latenz der Zeiterfassung zählen
+                record.timings["hold"] = schedule.held_seconds
+                record.timings["time_tracking"] = round(
+                    record.timings["time_tracking"] - schedule.held_seconds, 3
+                )
+            if schedule.prepare_seconds is not None:
+                record.timings["prepare"] = schedule.prepare_seconds
+            record.details.update(schedule.to_details())
             
             # Screenshot auf der Zeiterfassungsseite erstellen
-            await _capture_status_screenshot(page, config.screenshot_path)
+            with record.phase("screenshot"):
+                await _capture_status_screenshot(page, config.screenshot_path)
             
-            # Lade Feiertage mit intelligenter Cache-Logik
-            cache_path = Path("artifacts/holidays_cache.json")
-            holidays_list = await holidays.get_holidays_with_cache(page, base_url, cache_path, config.timeout)
+            if holiday_task is not None:
+                holidays_list = await holiday_task
+            else:
+                logging.info("Verwende gecachte Feiertage (Cache ist noch aktuell)")
+                holidays_list = holidays.load_holiday_ranges(cache_path)
             
             # Erweitere Feiertage zu einzelnen Tagen für die Prüfung
             holiday_dates = set()
             for holiday_range in holidays_list:
                 holiday_dates.update(holiday_range.expand())
             
-            logging.info(f"Verfügbare Feiertage: {len(holiday_dates)} Tage")
+            logging.info("Verfügbare Feiertage: %s Tage", len(holiday_dates))
+            if trace is not None:
+                # Erfolgreicher Lauf: Trace verwerfen
+                with record.phase("trace_stop"):
+                    await trace.discard()
             return status_text
+        except (Exception, asyncio.CancelledError):
+            if trace is not None:
+                await _save_failure_bundle(trace, page, config, record)
+            raise
         finally:
+            if holiday_task is not None and not holiday_task.done():
+                holiday_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await holiday_task
+            if recorder is not None:
+                # Auch bei Fehlern speichern – gerade dann sind die Fixtures interessant
+                await recorder.finish()
+            if tracer is not None:
+                network_path = record.sibling("network")
+                write_json(network_path, await tracer.summary())
+                record.details["network_summary"] = str(network_path)
+            peak_rss = await sampler.stop()
+            if peak_rss is not None:
+                record.details["browser_peak_rss_mb"] = peak_rss
+                logging.info(
+                    "Spitzen-RSS des Browsers: %s MB (Profil %s)", peak_rss, config.launch_profile
+                )
             await browser.close()
 
 
-async def login_portal(page: Page, credentials: Credentials, base_url: str, timeout: float) -> None:
+async def _load_holidays(
+    page: Page,
+    base_url: str,
+    cache_path: Path,
+    config: RunConfig,
+    record: RunRecord,
+    fetch_only: bool,
+) -> list[holidays.HolidayRange]:
+    """Lädt die Feiertage mit eigenem Timeout; Fehler fallen auf den vorhandenen Cache zurück."""
+
+    try:
+        with record.phase("holidays"):
+            if fetch_only:
+                # Aufnahme/Wiedergabe: Kursübersicht immer laden, Cache nicht anfassen
+                loader = holidays.fetch_holidays(page, base_url, config.timeout)
+            else:
+                loader = holidays.get_holidays_with_cache(page, base_url, cache_path, config.timeout)
+            return await asyncio.wait_for(loader, timeout=config.holiday_timeout)
+    except asyncio.TimeoutError:
+        logging.warning(
+            "Feiertage nicht innerhalb von %s s geladen – verwende vorhandenen Cache",
+            config.holiday_timeout,
+        )
+    except Exception as error:
+        logging.warning("Feiertage konnten nicht geladen werden (%s) – verwende vorhandenen Cache", error)
+    finally:
+        with contextlib.suppress(Exception):
+            await page.close()
+    return holidays.load_holiday_ranges(cache_path)
+
+
+async def _describe_elements(locator: Locator) -> list[dict[str, str]]:
+    """Liest Tag, Typ, ID, Wert und Text aller Treffer in einem einzigen Roundtrip."""
+    return await locator.evaluate_all(
+        """els => els.map(el => ({
+            tag: el.tagName || "",
+            type: el.type || "",
+            id: el.id || "",
+            value: el.value || "",
+            text: (el.textContent || "").trim(),
+        }))"""
+    )
+
+
+def _log_element_summary(context: str, elements: list[dict[str, str]]) -> None:
+    """Fasst die geprüften Elemente eines Fallbacks in einer DEBUG-Zeile zusammen."""
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+    logging.debug(
+        "%s: %s Elemente geprüft: %s",
+        context,
+        len(elements),
+        "; ".join(
+            f"{info['tag']} type={info['type']} id={info['id']} value={info['value']!r} text={info['text'][:40]!r}"
+            for info in elements
+        ),
+    )
+
+
+async def login_portal(
+    page: Page,
+    credentials: Credentials,
+    base_url: str,
+    timeout: float,
+    trace: Optional[FailureTrace] = None,
+) -> None:
     login_url = f"{base_url.rstrip('/')}/{LOGIN_PATH}"
-    logging.debug("Navigiere zur Login-Seite %s", login_url)
-    logging.info(f"Navigiere zu Login-Seite: {login_url}")
+    logging.info("Navigiere zur Login-Seite %s", login_url)
     await page.goto(login_url, timeout=timeout * 1000)
     await _human_scan(page)
 
@@ -244,7 +506,7 @@ async def login_portal(page: Page, credentials: Credentials, base_url: str, time
             button = page.locator(selector).first
             if await button.count() > 0:
                 login_button = button
-                logging.info(f"Login-Button gefunden mit Selektor: {selector}")
+                logging.info("Login-Button gefunden mit Selektor: %s", selector)
                 break
         except:
             continue
@@ -252,22 +514,19 @@ async def login_portal(page: Page, credentials: Credentials, base_url: str, time
     if not login_button:
         # Fallback: Suche nach allen möglichen Submit-Elementen
         all_buttons = page.locator("input, button")
-        count = await all_buttons.count()
-        logging.info(f"Gefundene Buttons/Inputs: {count}")
-        for i in range(count):
-            element = all_buttons.nth(i)
-            tag_name = await element.evaluate("el => el.tagName")
-            element_type = await element.evaluate("el => el.type")
-            element_id = await element.evaluate("el => el.id")
-            element_value = await element.evaluate("el => el.value")
-            logging.info(f"Element {i}: {tag_name} type={element_type} id={element_id} value={element_value}")
+        elements = await _describe_elements(all_buttons)
+        _log_element_summary("Login-Fallback", elements)
+        for i, info in enumerate(elements):
+            tag_name = info["tag"]
+            element_type = info["type"]
+            element_id = info["id"]
             
             if (tag_name.lower() == 'input' and element_type == 'submit') or \
                (tag_name.lower() == 'button' and element_type == 'submit') or \
                ('login' in (element_id or '').lower()) or \
                ('submit' in (element_id or '').lower()):
-                login_button = element
-                logging.info(f"Login-Button als Fallback gefunden: {tag_name} id={element_id}")
+                login_button = all_buttons.nth(i)
+                logging.info("Login-Button als Fallback gefunden: %s id=%s", tag_name, element_id)
                 break
 
     # Prüfe ob Elemente gefunden wurden
@@ -275,7 +534,12 @@ async def login_portal(page: Page, credentials: Credentials, base_url: str, time
     password_count = await password_input.count()
     login_count = 1 if login_button else 0
     
-    logging.info(f"Gefundene Elemente - Username: {username_count}, Password: {password_count}, Login-Button: {login_count}")
+    logging.info(
+        "Gefundene Elemente - Username: %s, Password: %s, Login-Button: %s",
+        username_count,
+        password_count,
+        login_count,
+    )
     
     if username_count == 0:
         raise LoginError("Username-Eingabefeld nicht gefunden")
@@ -284,12 +548,14 @@ async def login_portal(page: Page, credentials: Credentials, base_url: str, time
     if login_count == 0:
         raise LoginError("Login-Button nicht gefunden")
 
-    await _human_type(page, username_input, credentials.username)
-    await _human_pause(160, 320)
-    await _human_type(page, password_input, credentials.password)
+    # Zugangsdaten und Login-POST nicht im Fehler-Trace aufzeichnen
+    async with trace.suspended() if trace is not None else contextlib.nullcontext():
+        await _human_type(page, username_input, credentials.username)
+        await _human_pause(160, 320)
+        await _human_type(page, password_input, credentials.password)
 
-    async with page.expect_navigation(timeout=timeout * 1000):
-        await _human_click(page, login_button)
+        async with page.expect_navigation(timeout=timeout * 1000):
+            await _human_click(page, login_button)
     await _human_pause(220, 420)
     await _human_random_mouse_move(page)
 
@@ -299,7 +565,14 @@ async def login_portal(page: Page, credentials: Credentials, base_url: str, time
     logging.debug("Login erfolgreich abgeschlossen")
 
 
-async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: float) -> str:
+async def handle_time_tracking(
+    page: Page,
+    mode: str,
+    base_url: str,
+    timeout: float,
+    recorder: Optional[FixtureRecorder] = None,
+    schedule: Optional[ClickSchedule] = None,
+) -> str:
     time_url = f"{base_url.rstrip('/')}/{TIME_PATH}"
     logging.debug("Öffne Zeiterfassungsseite %s", time_url)
     await page.goto(time_url, timeout=timeout * 1000)
@@ -321,7 +594,7 @@ async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: fl
             button = page.locator(selector).first
             if await button.count() > 0:
                 open_button = button
-                logging.info(f"Zeiterfassung öffnen Button gefunden: {selector}")
+                logging.info("Zeiterfassung öffnen Button gefunden: %s", selector)
                 break
         except:
             continue
@@ -333,25 +606,7 @@ async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: fl
     else:
         logging.info("Kein 'Zeiterfassung öffnen' Button gefunden - versuche direkt Status zu lesen")
     
-    # Versuche verschiedene Status-Selektoren
-    status_selectors = [
-        "#zeiterfassungdetailscontainer p",
-        ".zeiterfassung p",
-        "#status p",
-        "p"
-    ]
-    
-    status_text = ""
-    for selector in status_selectors:
-        try:
-            status_locator = page.locator(selector)
-            if await status_locator.count() > 0:
-                status_text = (await status_locator.first.inner_text()).strip()
-                if status_text and ("Kommen" in status_text or "Gehen" in status_text):
-                    logging.info(f"Status gefunden mit Selektor {selector}: {status_text}")
-                    break
-        except:
-            continue
+    status_text = await _read_status_from_dom(page)
     
     if not status_text:
         logging.warning("Kein Status gefunden - verwende Fallback")
@@ -363,6 +618,9 @@ async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: fl
 
     if mode == "test":
         logging.debug("Testmodus aktiviert – keine Umschaltung des Status.")
+        if recorder is not None:
+            # Für die Aufnahme den Dialogzustand erfassen, ohne etwas zu buchen
+            await _open_dialog(page, timeout, recorder)
         return status_text
 
     if mode not in {"start", "stop"}:
@@ -378,7 +636,7 @@ async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: fl
     if alternative_keyword not in status_text:
         raise StatusError(f"Unbekannter Status: {status_text}")
 
-    await _open_dialog(page, timeout)
+    await _open_dialog(page, timeout, recorder)
     
     # Versuche verschiedene Selektoren für den Kommen/Gehen Button
     action_button_selectors = [
@@ -398,7 +656,7 @@ async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: fl
             button = page.locator(selector).first
             if await button.count() > 0:
                 button_locator = button
-                logging.info(f"Kommen/Gehen Button gefunden: {selector}")
+                logging.info("Kommen/Gehen Button gefunden: %s", selector)
                 break
         except:
             continue
@@ -406,18 +664,16 @@ async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: fl
     if not button_locator:
         # Fallback: Suche nach allen Buttons im Dialog
         dialog_buttons = page.locator("#kugDialog input, #kugDialog button")
-        count = await dialog_buttons.count()
-        logging.info(f"Suche Kommen/Gehen Button unter {count} Dialog-Buttons")
-        for i in range(count):
-            element = dialog_buttons.nth(i)
-            element_value = await element.evaluate("el => el.value")
-            element_text = await element.evaluate("el => el.textContent")
-            logging.info(f"Dialog-Button {i}: value='{element_value}' text='{element_text}'")
+        elements = await _describe_elements(dialog_buttons)
+        _log_element_summary("Kommen/Gehen-Fallback", elements)
+        for i, info in enumerate(elements):
+            element_value = info["value"]
+            element_text = info["text"]
             
             if ('kommen' in (element_value or '').lower()) or ('gehen' in (element_value or '').lower()) or \
                ('kommen' in (element_text or '').lower()) or ('gehen' in (element_text or '').lower()):
-                button_locator = element
-                logging.info(f"Kommen/Gehen Button als Fallback gefunden: {element_value}")
+                button_locator = dialog_buttons.nth(i)
+                logging.info("Kommen/Gehen Button als Fallback gefunden: %s", element_value)
                 break
     
     if not button_locator:
@@ -431,18 +687,78 @@ async def handle_time_tracking(page: Page, mode: str, base_url: str, timeout: fl
             f"Dialog-Button ({button_text}) passt nicht zum erwarteten Modus {expected_keyword}."
         )
 
-    async with page.expect_navigation(wait_until="load", timeout=timeout * 1000):
-        await _human_click(page, button_locator)
+    # Maus vor dem Warten auf den Button bringen, damit der Klick selbst pünktlich erfolgt
+    await _move_mouse_to(page, button_locator)
+    await button_locator.hover()
+    if schedule is not None:
+        # Alles vorbereitet: erst zur geplanten Zeit klicken
+        await schedule.hold()
+    async with page.expect_navigation(wait_until="load", timeout=timeout * 1000) as navigation:
+        if schedule is not None:
+            # Klickzeitpunkt, nicht Ende des Seitenaufbaus
+            schedule.mark_clicked()
+        await button_locator.click(delay=random.randint(60, 180))
+    await _human_pause(140, 260)
 
-    await _human_pause(260, 520)
-    await status_locator.wait_for(timeout=timeout * 1000)
-    status_text = (await status_locator.inner_text()).strip()
+    # Neuen Status aus der Antwort der ausgelösten Navigation lesen statt erneut aus dem DOM
+    status_text = await _status_from_response(await navigation.value)
+    if status_text is None or expected_keyword not in status_text:
+        logging.info(
+            "Status aus Navigationsantwort nicht verwertbar (%s) – lese DOM", status_text
+        )
+        status_text = await _read_status_from_dom(page, timeout)
+    if expected_keyword not in status_text:
+        # Der Klick ist bereits erfolgt; ein Fehlerlauf würde eine gültige Buchung verschleiern
+        logging.warning(
+            "Status nach Aktion passt nicht zu %s: %s", expected_keyword, status_text or "(leer)"
+        )
     logging.debug("Neuer Status nach Aktion: %s", status_text)
     await _human_random_mouse_move(page)
     return status_text
 
 
-async def _open_dialog(page: Page, timeout: float) -> None:
+async def _read_status_from_dom(page: Page, timeout: Optional[float] = None) -> str:
+    """Liest den Status über die Selektorliste; leer, wenn nichts gefunden wurde.
+
+    Mit `timeout` wird zuerst auf einen per Skript nachgeladenen Statustext gewartet.
+    """
+    if timeout is not None:
+        status_selector = ", ".join(
+            f'{selector}:text-matches("Kommen|Gehen")' for selector in STATUS_SELECTORS
+        )
+        try:
+            await page.wait_for_selector(status_selector, timeout=timeout * 1000)
+        except PlaywrightTimeoutError:
+            logging.warning("Kein Statustext innerhalb von %s s erschienen", timeout)
+    status_text = ""
+    for selector in STATUS_SELECTORS:
+        try:
+            status_locator = page.locator(selector)
+            if await status_locator.count() > 0:
+                status_text = (await status_locator.first.inner_text()).strip()
+                if status_text and ("Kommen" in status_text or "Gehen" in status_text):
+                    logging.info("Status gefunden mit Selektor %s: %s", selector, status_text)
+                    break
+        except:
+            continue
+    return status_text
+
+
+async def _status_from_response(response: Optional[Response]) -> Optional[str]:
+    if response is None:
+        return None
+    try:
+        html = await response.text()
+    except Exception as error:
+        logging.debug("Navigationsantwort nicht lesbar: %s", error)
+        return None
+    status_text = parse_status(html)
+    if status_text is not None:
+        logging.info("Status aus Navigationsantwort: %s", status_text)
+    return status_text
+
+
+async def _open_dialog(page: Page, timeout: float, recorder: Optional[FixtureRecorder] = None) -> None:
     logging.debug("Öffne Zeiterfassungsdialog")
     
     # Versuche verschiedene Selektoren für den Dialog-Button
@@ -463,7 +779,7 @@ async def _open_dialog(page: Page, timeout: float) -> None:
             button = page.locator(selector).first
             if await button.count() > 0:
                 trigger = button
-                logging.info(f"Dialog-Button gefunden: {selector}")
+                logging.info("Dialog-Button gefunden: %s", selector)
                 break
         except:
             continue
@@ -471,17 +787,15 @@ async def _open_dialog(page: Page, timeout: float) -> None:
     if not trigger:
         # Fallback: Suche nach allen möglichen Buttons
         all_buttons = page.locator("input, button")
-        count = await all_buttons.count()
-        logging.info(f"Suche Dialog-Button unter {count} Buttons")
-        for i in range(count):
-            element = all_buttons.nth(i)
-            element_value = await element.evaluate("el => el.value")
-            element_text = await element.evaluate("el => el.textContent")
-            logging.info(f"Button {i}: value='{element_value}' text='{element_text}'")
+        elements = await _describe_elements(all_buttons)
+        _log_element_summary("Dialog-Fallback", elements)
+        for i, info in enumerate(elements):
+            element_value = info["value"]
+            element_text = info["text"]
             
             if ('öffnen' in (element_value or '').lower()) or ('öffnen' in (element_text or '').lower()):
-                trigger = element
-                logging.info(f"Dialog-Button als Fallback gefunden: {element_value}")
+                trigger = all_buttons.nth(i)
+                logging.info("Dialog-Button als Fallback gefunden: %s", element_value)
                 break
     
     if not trigger:
@@ -491,6 +805,8 @@ async def _open_dialog(page: Page, timeout: float) -> None:
     await _human_click(page, trigger)
     await page.locator("#kugDialog form").wait_for(timeout=timeout * 1000)
     await _human_pause(200, 360)
+    if recorder is not None:
+        await recorder.snapshot(page, "kug_dialog", "#kugDialog")
 
 
 async def _capture_status_screenshot(page: Page, path: Path) -> None:
@@ -503,12 +819,47 @@ async def _capture_status_screenshot(page: Page, path: Path) -> None:
     logging.info("Screenshot der gesamten Seite erstellt")
 
 
-async def run_with_timeout(config: RunConfig, max_duration: float = 90.0) -> str:
+async def _save_failure_bundle(
+    trace: FailureTrace, page: Optional[Page], config: RunConfig, record: RunRecord
+) -> None:
+    bundle = config.failure_dir / f"{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}_{config.mode}"
+    bundle.mkdir(parents=True, exist_ok=True)
+    logging.info("Sichere Fehlerpaket nach %s", bundle)
+
+    async def _capture() -> None:
+        if page is not None and not page.is_closed():
+            try:
+                await page.screenshot(path=bundle / "screenshot.png", full_page=True)
+            except Exception as error:
+                logging.warning("Fehler-Screenshot nicht möglich: %s", error)
+        try:
+            if not await trace.save(bundle / "trace.zip"):
+                logging.info("Kein Trace – Fehler während der Eingabe der Zugangsdaten")
+        except Exception as error:
+            logging.warning("Trace konnte nicht gespeichert werden: %s", error)
+
+    try:
+        await asyncio.wait_for(_capture(), timeout=15.0)
+    except asyncio.TimeoutError:
+        logging.warning("Sichern des Fehlerpakets abgebrochen (Timeout)")
+    record.details["failure_bundle"] = str(bundle)
+    prune_bundles(
+        config.failure_dir, max_count=config.failure_keep, max_bytes=config.failure_max_bytes
+    )
+
+
+async def run_with_timeout(
+    config: RunConfig, max_duration: float = 90.0, record: Optional[RunRecord] = None
+) -> str:
     """Wrapper, um den Bot mit Timeout auszuführen."""
 
+    if config.action_at is not None:
+        # Die Wartezeit bis zum geplanten Klick zählt nicht zum Laufzeitbudget
+        hold = (config.action_at - dt.datetime.now(config.action_at.tzinfo)).total_seconds()
+        max_duration += max(0.0, hold)
     logging.debug("Starte run_with_timeout mit max_duration=%s", max_duration)
     try:
-        return await asyncio.wait_for(run_bot(config), timeout=max_duration)
+        return await asyncio.wait_for(run_bot(config, record), timeout=max_duration)
     except asyncio.TimeoutError as exc:
         raise AutomationError("Timeout beim Botlauf") from exc
 
@@ -552,11 +903,11 @@ def load_credentials_from_env(prefix: str = "CC") -> Credentials:
     return Credentials(username=username, password=password)
 
 
-async def safe_run(config: RunConfig) -> tuple[bool, str]:
+async def safe_run(config: RunConfig, record: Optional[RunRecord] = None) -> tuple[bool, str]:
     """Führt den Bot aus und fängt Fehler ab."""
 
     try:
-        status = await run_with_timeout(config)
+        status = await run_with_timeout(config, record=record)
     except AutomationError as error:
         logging.exception("Automation fehlgeschlagen")
         return False, str(error)
@@ -5,15 +5,133 @@ from __future__ import annotations
 import argparse
 import asyncio
 import datetime as dt
+import json
 import logging
+import os
 import random
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows (lokale Entwicklung)
+    fcntl = None
 
 from telegram import Bot, InputFile
 
-from .bot import Credentials, RunConfig, TelegramConfig, safe_run
+from . import ledger
+from .bot import LAUNCH_PROFILES, Credentials, RunConfig, TelegramConfig, safe_run
+from .logs import configure_logging
+from .prewarm import PREPARE_PHASE, PhaseEstimator, wait_until
+from .records import RunRecord, write_json
+from .reporting import REPORT_POLICIES, append_digest, build_digest, decide_report, remember_report
+from .retention import RetentionPolicy, apply_retention
+
+
+LOCK_POLICIES = ("wait", "skip", "queue")
+EXIT_SKIPPED = 3
+
+
+class RunLock:
+    """Dateisperre (flock) für genau einen aktiven Botlauf pro Host.
+
+    Die Sperre wird vom Kernel freigegeben, wenn der Prozess abstürzt. Der Inhalt der
+    Sperrdatei (PID, Startzeit, Modus) bleibt dann stehen und wird beim nächsten Lauf
+    als veraltete Sperre erkannt und protokolliert.
+    """
+
+    def __init__(self, path: Path, policy: str, timeout: float, poll_interval: float = 0.5) -> None:
+        self.path = path
+        self.policy = policy
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.wait_seconds = 0.0
+        self._file: Optional[IO[str]] = None
+
+    @staticmethod
+    def _try_lock(file: IO[str]) -> bool:
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _holder(self) -> str:
+        try:
+            return self.path.read_text(encoding="utf-8").strip()
+        except OSError:
+            return ""
+
+    async def _wait_for(self, file: IO[str], timeout: Optional[float]) -> bool:
+        started = time.monotonic()
+        logging.info(
+            "Anderer Lauf aktiv (%s) – warte (Richtlinie %s)", self._holder() or "unbekannt", self.policy
+        )
+        while not self._try_lock(file):
+            if timeout is not None and time.monotonic() - started >= timeout:
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    async def acquire(self, mode: str) -> bool:
+        """Liefert False, wenn der Lauf laut Richtlinie übersprungen werden soll."""
+        if fcntl is None:
+            logging.debug("Keine Dateisperren verfügbar – Lauf ohne Sperre")
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        started = time.monotonic()
+        file = self.path.open("a+", encoding="utf-8")
+        acquired = self._try_lock(file)
+        if not acquired and self.policy == "wait":
+            acquired = await self._wait_for(file, self.timeout)
+        elif not acquired and self.policy == "queue":
+            # Nur ein Lauf darf warten; weitere (z. B. doppelte Cron-Auslösung) entfallen
+            queue_file = self.path.with_name(self.path.name + ".queue").open("a+", encoding="utf-8")
+            try:
+                if self._try_lock(queue_file):
+                    acquired = await self._wait_for(file, None)
+            finally:
+                queue_file.close()
+        self.wait_seconds = round(time.monotonic() - started, 3)
+
+        if not acquired:
+            file.close()
+            logging.warning(
+                "Lauf übersprungen – Sperre %s gehalten von %s (Richtlinie %s, gewartet %.1f s)",
+                self.path,
+                self._holder() or "unbekannt",
+                self.policy,
+                self.wait_seconds,
+            )
+            return False
+
+        stale = self._holder()
+        if stale:
+            logging.warning("Veraltete Sperre eines abgebrochenen Laufs übernommen: %s", stale)
+        file.seek(0)
+        file.truncate()
+        file.write(
+            json.dumps(
+                {"pid": os.getpid(), "mode": mode, "started_at": dt.datetime.now().isoformat(timespec="seconds")}
+            )
+        )
+        file.flush()
+        self._file = file
+        return True
+
+    def release(self) -> None:
+        if self._file is None:
+            return
+        # Inhalt leeren, damit ein sauber beendeter Lauf nicht als veraltet gilt
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.flush()
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -44,6 +162,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=45.0,
         help="Timeout in Sekunden für Seitennavigationen",
     )
+    parser.add_argument(
+        "--holiday-timeout",
+        type=float,
+        default=20.0,
+        help="Eigenes Timeout in Sekunden für das parallele Laden der Feiertage",
+    )
     parser.add_argument(
         "--headless",
         dest="headless",
@@ -57,6 +181,12 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_false",
         help="Playwright im sichtbaren Modus",
     )
+    parser.add_argument(
+        "--launch-profile",
+        choices=sorted(LAUNCH_PROFILES),
+        default="default",
+        help="Browser-Startprofil (lean=reduzierter Speicherbedarf für kleine Container)",
+    )
     parser.add_argument(
         "--start-time",
         default="13:20",
@@ -78,24 +208,202 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Führt vor dem Start eine zufällige Verzögerung aus",
     )
+    parser.add_argument(
+        "--no-prewarm",
+        dest="prewarm",
+        action="store_false",
+        default=True,
+        help="Startet den Browser erst zur geplanten Zeit statt vorab",
+    )
+    parser.add_argument(
+        "--prewarm-margin",
+        type=float,
+        default=5.0,
+        help="Zusätzlicher Vorlauf in Sekunden zur geschätzten Vorbereitungszeit",
+    )
+    parser.add_argument(
+        "--estimates-path",
+        default="artifacts/phase_estimates.json",
+        help="Gleitende Schätzung der Vorbereitungsdauer (Start, Login, Navigation)",
+    )
     parser.add_argument(
         "--timezone",
         default="UTC",
         help="Zeitzone für Zeitberechnungen (z.B. UTC, Europe/Berlin, CET)",
     )
+    parser.add_argument(
+        "--last-run-path",
+        default="artifacts/last_run.json",
+        help="Kopie des letzten Run-Records für den Health-Endpunkt (src.health)",
+    )
+    parser.add_argument(
+        "--lock-path",
+        default="artifacts/run.lock",
+        help="Sperrdatei, damit nie zwei Läufe gleichzeitig einen Browser starten",
+    )
+    parser.add_argument(
+        "--lock-policy",
+        choices=LOCK_POLICIES,
+        default="queue",
+        help=(
+            "Verhalten bei aktivem Lauf: wait=bis --lock-timeout warten, skip=sofort beenden, "
+            "queue=als einziger Lauf dahinter einreihen (weitere werden übersprungen)"
+        ),
+    )
+    parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=900.0,
+        help="Maximale Wartezeit in Sekunden für --lock-policy wait",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Prüft den Status immer im Portal, auch wenn das Ledger ihn bereits bestätigt",
+    )
+    parser.add_argument(
+        "--ledger-path",
+        default="artifacts/state_ledger.json",
+        help="Pfad des Ledgers mit dem zuletzt bestätigten Kommen/Gehen-Status",
+    )
+    parser.add_argument(
+        "--ledger-freshness-minutes",
+        type=float,
+        default=120.0,
+        help="So lange gilt ein bestätigter Status am selben Tag ohne erneute Portalprüfung",
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record",
+        metavar="DIR",
+        default=None,
+        help="Speichert bereinigte Login-, kug- und pers-Seiten sowie den #kugDialog als Fixtures",
+    )
+    fixtures.add_argument(
+        "--replay",
+        metavar="DIR",
+        default=None,
+        help="Beantwortet alle Portal-Requests offline aus aufgezeichneten Fixtures",
+    )
+    parser.add_argument(
+        "--record-redact",
+        action="append",
+        default=[],
+        metavar="TEXT",
+        help="Text (z. B. Klarname), der in Fixtures ersetzt wird; für --record Pflicht",
+    )
+    parser.add_argument(
+        "--report-policy",
+        choices=REPORT_POLICIES,
+        default="changes",
+        help=(
+            "Telegram-Berichte: always=Foto bei Erfolg, Fehler als Text, changes=Foto nur bei "
+            "Statuswechsel, Fehler oder erstem Lauf des Tages, sonst Textzeile, "
+            "quiet=wie changes, aber ohne Textzeile"
+        ),
+    )
+    parser.add_argument(
+        "--report-state",
+        default="artifacts/report_state.json",
+        help="Zustand der Berichte (letzter Status, letztes Foto); Tagesprotokolle liegen daneben",
+    )
+    parser.add_argument(
+        "--digest",
+        action="store_true",
+        help="Sendet nach dem Bericht eine Zusammenfassung aller Läufe des Tages",
+    )
+    parser.add_argument(
+        "--trace-network",
+        action="store_true",
+        help="Protokolliert Requests pro Navigation neben dem Run-Record",
+    )
+    parser.add_argument(
+        "--failure-dir",
+        default="artifacts/failures",
+        help="Verzeichnis für Fehlerpakete (Playwright-Trace und Screenshot)",
+    )
+    parser.add_argument(
+        "--no-failure-trace",
+        dest="failure_trace",
+        action="store_false",
+        default=True,
+        help="Deaktiviert das Tracing für Fehlerpakete",
+    )
+    parser.add_argument(
+        "--failure-keep",
+        type=int,
+        default=10,
+        help="Maximale Anzahl aufbewahrter Fehlerpakete",
+    )
+    parser.add_argument(
+        "--failure-max-mb",
+        type=float,
+        default=100.0,
+        help="Maximale Gesamtgröße der Fehlerpakete in MB",
+    )
+    parser.add_argument(
+        "--retention-max-age-days",
+        type=int,
+        default=60,
+        help="Löscht Laufartefakte (Screenshots, Run-Records) nach so vielen Tagen",
+    )
+    parser.add_argument(
+        "--retention-max-count",
+        type=int,
+        default=250,
+        help="Maximale Anzahl aufbewahrter Läufe",
+    )
+    parser.add_argument(
+        "--retention-max-mb",
+        type=float,
+        default=250.0,
+        help="Maximale Gesamtgröße der Laufartefakte in MB",
+    )
+    parser.add_argument(
+        "--retention-compact",
+        action="store_true",
+        help="Kodiert aufbewahrte Screenshots als WebP um (benötigt Pillow)",
+    )
+    parser.add_argument(
+        "--retention-archive-days",
+        type=int,
+        default=None,
+        help="Verschiebt Läufe ab diesem Alter in Monatsarchive (status_YYYYMM.zip)",
+    )
+    parser.add_argument(
+        "--retention-dry-run",
+        action="store_true",
+        help="Zeigt nur an, was die Retention löschen/umkodieren/archivieren würde",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
         help="Logging-Level (z. B. INFO, DEBUG)",
     )
-    return parser
-
-
-def configure_logging(level: str) -> None:
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    parser.add_argument(
+        "--log-file",
+        default=None,
+        help="Logdatei mit Größenrotation (Standard: Ausgabe auf stderr)",
     )
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default="text",
+        help="Logformat (json=kompakte JSON-Zeilen)",
+    )
+    parser.add_argument(
+        "--log-max-mb",
+        type=float,
+        default=5.0,
+        help="Maximale Größe der Logdatei in MB vor der Rotation",
+    )
+    parser.add_argument(
+        "--log-backups",
+        type=int,
+        default=3,
+        help="Anzahl aufbewahrter rotierter Logdateien",
+    )
+    return parser
 
 
 async def send_telegram_report(
@@ -104,40 +412,91 @@ async def send_telegram_report(
     success: bool,
     status_text: str,
     screenshot_path: Path,
+    photo: bool = True,
 ) -> None:
     bot = Bot(telegram_cfg.bot_token)
-    timestamp = dt.datetime.now().strftime("%d.%m.%Y %H:%M:%S")
+    now = dt.datetime.now()
     headline = "✅ Erfolg" if success else "❌ Fehler"
     message = (
         f"{headline} ({mode.capitalize()})\n"
-        f"Zeitpunkt: {timestamp}\n"
+        f"Zeitpunkt: {now.strftime('%d.%m.%Y %H:%M:%S')}\n"
         f"Status: {status_text}"
     )
 
     try:
-        if success and screenshot_path.exists():
+        if photo and screenshot_path.exists():
             with screenshot_path.open("rb") as file:
                 await bot.send_photo(
                     chat_id=telegram_cfg.chat_id,
                     photo=InputFile(file, filename=screenshot_path.name),
                     caption=message,
                 )
-        else:
+        elif photo or not success:
             await bot.send_message(chat_id=telegram_cfg.chat_id, text=message)
+        else:
+            # Routinelauf ohne Änderung: eine kompakte Zeile statt Foto
+            compact = f"{'✅' if success else '❌'} {mode.capitalize()} {now.strftime('%H:%M:%S')} · {status_text}"
+            await bot.send_message(chat_id=telegram_cfg.chat_id, text=compact)
+    finally:
+        try:
+            await bot.close()
+        except Exception as e:
+            logging.warning("Fehler beim Schließen des Telegram-Bots: %s", e)
+
+
+async def send_telegram_text(telegram_cfg: TelegramConfig, text: str) -> None:
+    bot = Bot(telegram_cfg.bot_token)
+    try:
+        await bot.send_message(chat_id=telegram_cfg.chat_id, text=text)
     finally:
         try:
             await bot.close()
         except Exception as e:
-            logging.warning(f"Fehler beim Schließen des Telegram-Bots: {e}")
+            logging.warning("Fehler beim Schließen des Telegram-Bots: %s", e)
+
+
+async def _report(
+    args: argparse.Namespace,
+    telegram_cfg: TelegramConfig,
+    success: bool,
+    status_text: str,
+    report_text: str,
+    photo_path: Path,
+    warning: bool = False,
+) -> None:
+    """Wendet die Berichtsrichtlinie an und sendet ggf. Bericht und Tageszusammenfassung."""
+
+    state_path = Path(args.report_state)
+    decision = decide_report(state_path, args.report_policy, success, status_text, warning=warning)
+    append_digest(state_path.parent, args.mode, success, status_text)
+    if decision.send:
+        logging.info("Telegram-Bericht %s (%s)", "mit Foto" if decision.photo else "als Text", decision.reason)
+        await send_telegram_report(
+            telegram_cfg, args.mode, success, report_text, photo_path, photo=decision.photo
+        )
+    else:
+        logging.info("Kein Telegram-Bericht (%s, Richtlinie %s)", decision.reason, args.report_policy)
+    remember_report(state_path, success, status_text, decision.send and decision.photo)
+
+    if args.digest:
+        digest = build_digest(state_path.parent, dt.date.today())
+        if digest:
+            await send_telegram_text(telegram_cfg, digest)
 
 
 def _parse_time(timestr: str) -> dt.time:
     return dt.datetime.strptime(timestr, "%H:%M").time()
 
 
-async def _apply_variation_if_needed(args: argparse.Namespace) -> None:
+DEFAULT_PREPARE_SECONDS = 30.0
+
+
+async def _apply_variation_if_needed(
+    args: argparse.Namespace, estimator: PhaseEstimator
+) -> Optional[dt.datetime]:
+    """Wartet bis zum (vorgewärmten) Start und liefert ggf. die geplante Klickzeit."""
     if not args.apply_variation:
-        return
+        return None
 
     scheduled_str = args.start_time if args.mode == "start" else args.end_time
     base_time = _parse_time(scheduled_str)
@@ -151,28 +510,60 @@ async def _apply_variation_if_needed(args: argparse.Namespace) -> None:
         timezone=args.timezone
     )
     
-    # Berechne Wartezeit bis zur geplanten Zeit
-    import zoneinfo
-    try:
-        tz = zoneinfo.ZoneInfo(args.timezone)
-    except zoneinfo.ZoneInfoNotFoundError:
-        logging.warning("Zeitzone %s nicht gefunden, verwende UTC", args.timezone)
-        tz = zoneinfo.ZoneInfo("UTC")
-    
-    now = dt.datetime.now(tz)
-    wait_seconds = max(0, int((scheduled_time - now).total_seconds()))
+    # Browserstart, Login und Navigation vorziehen, damit der Klick zur geplanten Zeit erfolgt
+    prewarm = args.prewarm and args.mode in {"start", "stop"}
+    lead_seconds = 0.0
+    if prewarm:
+        lead_seconds = estimator.estimate(PREPARE_PHASE, DEFAULT_PREPARE_SECONDS) + args.prewarm_margin
+    launch_time = scheduled_time - dt.timedelta(seconds=lead_seconds)
+    now = dt.datetime.now(scheduled_time.tzinfo)
+    wait_seconds = max(0, int((launch_time - now).total_seconds()))
 
     logging.info(
-        "Starte Verzögerung für Modus %s: Basis %s (%s), Variation ±%s Minuten, geplante Zeit %s, gewartet %s Sekunden",
+        "Starte Verzögerung für Modus %s: Basis %s (%s), Variation ±%s Minuten, geplante Zeit %s, Vorlauf %.1f Sekunden, gewartet %s Sekunden",
         args.mode,
         base_time.strftime("%H:%M"),
         args.timezone,
         variation,
         scheduled_time.strftime("%H:%M:%S"),
+        lead_seconds,
         wait_seconds,
     )
-    if wait_seconds > 0:
-        await asyncio.sleep(wait_seconds)
+    await wait_until(launch_time)
+    return scheduled_time if prewarm else None
+
+
+def _click_report_line(details: dict) -> str:
+    if "click_offset_s" not in details:
+        return ""
+    planned = dt.datetime.fromisoformat(details["click_planned"])
+    actual = dt.datetime.fromisoformat(details["click_actual"])
+    return (
+        f"\nKlick: geplant {planned.strftime('%H:%M:%S')}, erfolgt {actual.strftime('%H:%M:%S')}"
+        f" ({details['click_offset_s']:+.1f} s)"
+    )
+
+
+def _apply_retention(args: argparse.Namespace, directory: Path) -> None:
+    policy = RetentionPolicy(
+        max_age_days=args.retention_max_age_days,
+        max_count=args.retention_max_count,
+        max_bytes=int(args.retention_max_mb * 1024 * 1024),
+        compact=args.retention_compact,
+        archive_after_days=args.retention_archive_days,
+        dry_run=args.retention_dry_run,
+    )
+    try:
+        apply_retention(directory, policy)
+    except OSError as error:
+        logging.warning("Retention fehlgeschlagen: %s", error)
+
+
+def _write_record(args: argparse.Namespace, record: RunRecord) -> None:
+    record.write()
+    if not args.replay:
+        # Feste Datei, damit der Health-Endpunkt nicht nach dem neuesten Record suchen muss
+        write_json(Path(args.last_run_path), record.to_dict())
 
 
 async def async_main(args: argparse.Namespace) -> int:
@@ -186,8 +577,82 @@ async def async_main(args: argparse.Namespace) -> int:
         / f"status_{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
     )
 
-    await _apply_variation_if_needed(args)
+    ledger_path = Path(args.ledger_path)
+    if await _report_ledger_hit(args, telegram_cfg, ledger_path, screenshot_path):
+        return 0
 
+    estimator = PhaseEstimator(Path(args.estimates_path))
+    action_at = await _apply_variation_if_needed(args, estimator)
+
+    # Sperre erst nach der Variationswartezeit: sie schützt nur die Browsersitzung
+    lock = RunLock(Path(args.lock_path), args.lock_policy, args.lock_timeout)
+    if not await lock.acquire(args.mode):
+        return EXIT_SKIPPED
+    try:
+        # Ein Lauf, auf den gewartet wurde, kann den Modus inzwischen bestätigt haben
+        if await _report_ledger_hit(args, telegram_cfg, ledger_path, screenshot_path, lock.wait_seconds):
+            return 0
+        return await _run_locked(
+            args,
+            credentials,
+            telegram_cfg,
+            screenshot_path,
+            ledger_path,
+            estimator,
+            action_at,
+            lock.wait_seconds,
+        )
+    finally:
+        lock.release()
+
+
+async def _report_ledger_hit(
+    args: argparse.Namespace,
+    telegram_cfg: TelegramConfig,
+    ledger_path: Path,
+    screenshot_path: Path,
+    lock_wait: Optional[float] = None,
+) -> bool:
+    """Meldet einen laut Ledger bereits bestätigten Modus, ohne das Portal zu prüfen."""
+    if args.mode not in ledger.STATUS_KEYWORDS or args.verify or args.replay:
+        return False
+    entry = ledger.lookup(
+        ledger_path, args.mode, dt.timedelta(minutes=args.ledger_freshness_minutes)
+    )
+    if entry is None:
+        return False
+
+    # Doppelter Cron-Lauf oder manuelle Wiederholung: kein Browserstart nötig
+    logging.info(
+        "Modus %s laut Ledger bereits bestätigt um %s – Portal wird nicht geprüft",
+        args.mode,
+        entry.confirmed_at.strftime("%H:%M:%S"),
+    )
+    status_text = (
+        f"{entry.status_text} (laut Ledger, bestätigt {entry.confirmed_at.strftime('%H:%M:%S')})"
+    )
+    record = RunRecord(mode=args.mode, path=screenshot_path.with_suffix(".json"))
+    if lock_wait is not None:
+        record.timings["lock_wait"] = lock_wait
+    record.success = True
+    record.status_text = status_text
+    record.details["ledger_hit"] = True
+    _write_record(args, record)
+    await _report(args, telegram_cfg, True, entry.status_text, status_text, screenshot_path)
+    _apply_retention(args, screenshot_path.parent)
+    return True
+
+
+async def _run_locked(
+    args: argparse.Namespace,
+    credentials: Credentials,
+    telegram_cfg: TelegramConfig,
+    screenshot_path: Path,
+    ledger_path: Path,
+    estimator: PhaseEstimator,
+    action_at: Optional[dt.datetime],
+    lock_wait: float,
+) -> int:
     run_config = RunConfig(
         credentials=credentials,
         telegram=telegram_cfg,
@@ -197,17 +662,68 @@ async def async_main(args: argparse.Namespace) -> int:
         headless=args.headless,
         timeout=args.timeout,
         timezone=args.timezone,
+        trace_network=args.trace_network,
+        failure_dir=Path(args.failure_dir) if args.failure_trace else None,
+        failure_keep=args.failure_keep,
+        failure_max_bytes=int(args.failure_max_mb * 1024 * 1024),
+        launch_profile=args.launch_profile,
+        record_dir=Path(args.record) if args.record else None,
+        replay_dir=Path(args.replay) if args.replay else None,
+        record_redact=args.record_redact,
+        holiday_timeout=args.holiday_timeout,
+        action_at=action_at,
     )
 
-    success, status_text = await safe_run(run_config)
-    await send_telegram_report(telegram_cfg, args.mode, success, status_text, screenshot_path)
+    record = RunRecord(mode=args.mode, path=screenshot_path.with_suffix(".json"))
+    record.timings["lock_wait"] = lock_wait
+    success, status_text = await safe_run(run_config, record)
+    record.success = success
+    record.status_text = status_text
+    _write_record(args, record)
+    if args.replay:
+        # Offline-Wiedergabe: weder Ledger noch Telegram berühren
+        logging.info("Replay beendet (%s): %s", "Erfolg" if success else "Fehler", status_text)
+        return 0 if success else 1
+    unconfirmed = record.details.get("status_unconfirmed")
+    if unconfirmed:
+        logging.warning("Status nach dem Klick nicht bestätigt (erwartet %s)", unconfirmed)
+    if success and not unconfirmed:
+        ledger.record_status(ledger_path, status_text)
+        if PREPARE_PHASE in record.timings:
+            estimator.update(PREPARE_PHASE, record.timings[PREPARE_PHASE])
+    if "click_offset_s" in record.details:
+        logging.info(
+            "Klick geplant %s, erfolgt %s (Abweichung %+.3f s)",
+            record.details["click_planned"],
+            record.details["click_actual"],
+            record.details["click_offset_s"],
+        )
+    report_text = status_text + _click_report_line(record.details)
+    if unconfirmed:
+        report_text += f"\n⚠️ Klick erfolgt, Status zeigt aber nicht {unconfirmed} – bitte im Portal prüfen"
+    photo_path = screenshot_path
+    if not success and "failure_bundle" in record.details:
+        photo_path = Path(record.details["failure_bundle"]) / "screenshot.png"
+    await _report(
+        args, telegram_cfg, success, status_text, report_text, photo_path, warning=bool(unconfirmed)
+    )
+    _apply_retention(args, screenshot_path.parent)
     return 0 if success else 1
 
 
 def main(argv: Optional[list[str]] = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
-    configure_logging(args.log_level.upper())
+    if args.record and not args.record_redact:
+        # Klarnamen lassen sich nicht zuverlässig erkennen und müssen explizit angegeben werden
+        parser.error("--record benötigt mindestens ein --record-redact (z. B. den Klarnamen)")
+    configure_logging(
+        args.log_level.upper(),
+        args.log_file,
+        args.log_format,
+        int(args.log_max_mb * 1024 * 1024),
+        args.log_backups,
+    )
     try:
         return asyncio.run(async_main(args))
     except KeyboardInterrupt:
@@ -0,0 +1,167 @@
+"""Aufzeichnung von Portalseiten als Offline-Fixtures und deren Wiedergabe via `page.route`."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from playwright.async_api import BrowserContext, Page, Response, Route
+
+MANIFEST_NAME = "manifest.json"
+RECORDED_TYPES = {"document", "xhr", "fetch"}
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+SESSION_PATTERN = re.compile(r"((?:PHPSESSID|sid|session|token)=)[^&\"'\s;<>]+", re.IGNORECASE)
+# Persönliche Angaben der pers-Seite; der Klarname muss per --record-redact übergeben werden
+BIRTH_DATE_PATTERN = re.compile(
+    r"((?:geb\.|geboren(?: am)?|Geburtsdatum:?)\s*)\d{1,2}\.\d{1,2}\.\d{2,4}", re.IGNORECASE
+)
+STUDENT_ID_PATTERN = re.compile(
+    r"((?:Matrikel(?:nummer|nr\.?)?|Teilnehmer(?:nummer|nr\.?))\s*:?\s*)\d+", re.IGNORECASE
+)
+SECRET_INPUT_PATTERN = re.compile(
+    r"(<input\b[^>]*\btype=[\"']?(?:password|hidden)[\"']?[^>]*\bvalue=)([\"'])[^\"']*\2",
+    re.IGNORECASE,
+)
+SECRET_INPUT_VALUE_FIRST_PATTERN = re.compile(
+    r"(<input\b[^>]*\bvalue=)([\"'])[^\"']*\2([^>]*\btype=[\"']?(?:password|hidden)[\"']?)",
+    re.IGNORECASE,
+)
+
+
+def sanitize_html(html: str, secrets: Iterable[str]) -> str:
+    """Entfernt Zugangsdaten, Kontakt- und Personendaten, Session-IDs und versteckte Formularwerte."""
+
+    for secret in sorted({value for value in secrets if value}, key=len, reverse=True):
+        html = html.replace(secret, "***")
+    html = SECRET_INPUT_PATTERN.sub(r"\1\2\2", html)
+    html = SECRET_INPUT_VALUE_FIRST_PATTERN.sub(r"\1\2\2\3", html)
+    html = EMAIL_PATTERN.sub("user@example.invalid", html)
+    html = BIRTH_DATE_PATTERN.sub(r"\g<1>01.01.1970", html)
+    html = STUDENT_ID_PATTERN.sub(r"\g<1>000000", html)
+    return redact_url(html)
+
+
+def redact_url(url: str) -> str:
+    """Ersetzt Session-IDs und Tokens, damit Manifest und bereinigtes HTML übereinstimmen."""
+    return SESSION_PATTERN.sub(r"\1redacted", url)
+
+
+def request_key(method: str, url: str) -> str:
+    parts = urlsplit(redact_url(url))
+    path = parts.path or "/"
+    return f"{method.upper()} {path}?{parts.query}" if parts.query else f"{method.upper()} {path}"
+
+
+def _fixture_name(index: int, method: str, url: str) -> str:
+    command = parse_qs(urlsplit(url).query).get("cmd", ["index"])[0]
+    slug = re.sub(r"[^a-zA-Z0-9_-]", "_", command)
+    return f"{index:02d}_{slug}_{method.lower()}.html"
+
+
+class FixtureRecorder:
+    """Speichert bereinigte Dokument- und XHR-Antworten des Portals samt Manifest."""
+
+    def __init__(self, directory: Path, secrets: Iterable[str]) -> None:
+        self.directory = directory
+        self._secrets = list(secrets)
+        self._entries: list[dict[str, Any]] = []
+        self._pending: set[asyncio.Task] = set()
+
+    def attach(self, page: Page) -> None:
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response) -> None:
+        if response.request.resource_type not in RECORDED_TYPES:
+            return
+        task = asyncio.ensure_future(self._store(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _store(self, response: Response) -> None:
+        request = response.request
+        entry: dict[str, Any] = {
+            "key": request_key(request.method, request.url),
+            "status": response.status,
+            "content_type": response.headers.get("content-type", "text/html"),
+        }
+        if 300 <= response.status < 400:
+            entry["location"] = redact_url(response.headers.get("location", ""))
+            body = ""
+        else:
+            try:
+                body = await response.text()
+            except Exception as error:  # pragma: no cover - Antwort nicht mehr verfügbar
+                logging.debug("Fixture für %s nicht lesbar: %s", request.url, error)
+                return
+        # Index erst nach dem await vergeben, damit parallele Antworten eindeutig bleiben
+        entry["file"] = _fixture_name(len(self._entries), request.method, request.url)
+        self._entries.append(entry)
+        self._write(entry["file"], body)
+
+    async def snapshot(self, page: Page, name: str, selector: str) -> None:
+        """Speichert den aktuellen DOM-Zustand eines Elements (z. B. `#kugDialog`)."""
+        locator = page.locator(selector).first
+        if not await locator.count():
+            logging.info("Fixture %s: Selektor %s nicht gefunden", name, selector)
+            return
+        self._write(f"{name}.html", await locator.evaluate("el => el.outerHTML"))
+
+    def _write(self, filename: str, body: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / filename).write_text(sanitize_html(body, self._secrets), encoding="utf-8")
+
+    async def finish(self) -> None:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / MANIFEST_NAME).write_text(
+            json.dumps(self._entries, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        logging.info("%s Fixtures nach %s geschrieben", len(self._entries), self.directory)
+
+
+class FixtureReplayer:
+    """Beantwortet alle Requests aus aufgezeichneten Fixtures; Unbekanntes wird abgebrochen."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+        self._responses: dict[str, list[dict[str, Any]]] = {}
+        for entry in manifest:
+            self._responses.setdefault(entry["key"], []).append(entry)
+        self._served: dict[str, int] = {}
+
+    async def install(self, context: BrowserContext) -> None:
+        await context.route("**/*", self._handle)
+
+    def _next_entry(self, key: str) -> Optional[dict[str, Any]]:
+        entries = self._responses.get(key)
+        if not entries:
+            return None
+        # Wiederholte Requests erhalten die Antworten in Aufnahmereihenfolge, danach die letzte
+        index = self._served.get(key, 0)
+        self._served[key] = index + 1
+        return entries[min(index, len(entries) - 1)]
+
+    async def _handle(self, route: Route) -> None:
+        request = route.request
+        entry = self._next_entry(request_key(request.method, request.url))
+        if entry is None:
+            logging.debug("Replay: keine Fixture für %s %s", request.method, request.url)
+            if request.resource_type == "document":
+                await route.fulfill(status=404, body="", content_type="text/html")
+            else:
+                await route.abort()
+            return
+
+        headers = {"content-type": entry["content_type"]}
+        if entry.get("location"):
+            headers["location"] = entry["location"]
+        body = (self.directory / entry["file"]).read_text(encoding="utf-8")
+        await route.fulfill(status=entry["status"], headers=headers, body=body)
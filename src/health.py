@@ -0,0 +1,287 @@
+"""Leichtgewichtiger HTTP-Endpunkt für Health-Checks und Prometheus-Metriken.
+
+Liest ausschließlich Dateien (Run-Record, Cron-Datei, Feiertags-Cache) und startet
+niemals Playwright, damit der Endpunkt im Sekundentakt abgefragt werden kann.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import logging
+import shlex
+import sys
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+LAST_RUN_NAME = "last_run.json"
+HOLIDAY_CACHE_NAME = "holidays_cache.json"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass(slots=True)
+class CronEntry:
+    mode: str
+    minute: int
+    hour: int
+    weekdays: frozenset[int]
+
+    def next_fire(self, now: dt.datetime) -> dt.datetime:
+        candidate = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if candidate <= now:
+            candidate += dt.timedelta(days=1)
+        for _ in range(7):
+            # Cron zählt Sonntag als 0 (und 7), Python als 6
+            if (candidate.weekday() + 1) % 7 in self.weekdays:
+                return candidate
+            candidate += dt.timedelta(days=1)
+        return candidate
+
+
+def _parse_weekdays(field: str) -> frozenset[int]:
+    if field == "*":
+        return frozenset(range(7))
+    days: set[int] = set()
+    for part in field.split(","):
+        if "-" in part:
+            first, last = (int(value) for value in part.split("-", 1))
+            days.update(range(first, last + 1))
+        else:
+            days.add(int(part))
+    return frozenset(day % 7 for day in days)
+
+
+def parse_cron_entries(text: str) -> list[CronEntry]:
+    """Liest die vom Scheduler geschriebenen Zeilen (`M H * * DOW root ... --mode X`)."""
+
+    entries: list[CronEntry] = []
+    for line in text.splitlines():
+        fields = line.split(None, 6)
+        if len(fields) < 7 or "=" in fields[0] or line.lstrip().startswith("#"):
+            continue
+        try:
+            tokens = shlex.split(fields[6])
+            mode = tokens[tokens.index("--mode") + 1]
+            entries.append(CronEntry(mode, int(fields[0]), int(fields[1]), _parse_weekdays(fields[4])))
+        except (ValueError, IndexError):
+            logging.debug("Cron-Zeile nicht auswertbar: %s", fields[:5])
+    return entries
+
+
+class _CachedFile:
+    """Hält den geparsten Dateiinhalt, bis sich mtime oder Größe ändern."""
+
+    def __init__(self, path: Path, parse: Callable[[str], Any]) -> None:
+        self.path = path
+        self._parse = parse
+        self._signature: Optional[tuple[float, int]] = None
+        self._value: Any = None
+        self._lock = threading.Lock()
+
+    def mtime(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except OSError:
+            return None
+
+    def load(self) -> Any:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        signature = (stat.st_mtime, stat.st_size)
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    self._value = self._parse(self.path.read_text(encoding="utf-8"))
+                except (OSError, ValueError) as error:
+                    logging.warning("Health: %s unlesbar: %s", self.path, error)
+                    self._value = None
+                self._signature = signature
+            return self._value
+
+
+class HealthState:
+    """Baut Health-JSON und Metriken aus den Artefakten eines Arbeitsverzeichnisses."""
+
+    def __init__(self, artifacts_dir: Path, cron_file: Path, fail_on_last_run: bool = False) -> None:
+        self._fail_on_last_run = fail_on_last_run
+        self._last_run = _CachedFile(artifacts_dir / LAST_RUN_NAME, json.loads)
+        self._cron = _CachedFile(cron_file, parse_cron_entries)
+        self._holiday_cache = artifacts_dir / HOLIDAY_CACHE_NAME
+
+    def snapshot(self, now: Optional[dt.datetime] = None) -> dict[str, Any]:
+        now = now or dt.datetime.now()
+        last_run = self._last_run.load()
+        entries = self._cron.load()
+
+        next_runs = sorted(
+            ((entry.next_fire(now), entry.mode) for entry in entries or []), key=lambda item: item[0]
+        )
+        try:
+            holiday_mtime: Optional[float] = self._holiday_cache.stat().st_mtime
+        except OSError:
+            holiday_mtime = None
+        # Nur Liveness-Probleme machen den Container unhealthy; ein Neustart behebt
+        # keinen Portalausfall, daher zählt ein Fehllauf nur auf ausdrücklichen Wunsch
+        problems: list[str] = []
+        warnings: list[str] = []
+        if entries is None:
+            problems.append("Cron-Datei fehlt")
+        elif not entries:
+            problems.append("keine Cron-Einträge")
+        if last_run is not None and last_run.get("success") is False:
+            (problems if self._fail_on_last_run else warnings).append("letzter Lauf fehlgeschlagen")
+
+        finished_mtime = self._last_run.mtime()
+        return {
+            "status": "error" if problems else "degraded" if warnings else "ok",
+            "problems": problems,
+            "warnings": warnings,
+            "time": now.isoformat(timespec="seconds"),
+            "last_run": None
+            if last_run is None
+            else {
+                "mode": last_run.get("mode"),
+                "success": last_run.get("success"),
+                "status_text": last_run.get("status_text"),
+                "started_at": last_run.get("started_at"),
+                "finished_at": dt.datetime.fromtimestamp(finished_mtime).isoformat(timespec="seconds")
+                if finished_mtime
+                else None,
+                "timings": last_run.get("timings", {}),
+            },
+            "next_runs": [
+                {"mode": mode, "at": fire.isoformat(timespec="seconds")} for fire, mode in next_runs
+            ],
+            "holiday_cache_age_s": round(now.timestamp() - holiday_mtime) if holiday_mtime else None,
+        }
+
+    def metrics(self, now: Optional[dt.datetime] = None) -> str:
+        """Prometheus-Textformat (Version 0.0.4)."""
+
+        snapshot = self.snapshot(now)
+        lines = [
+            "# HELP cc_bot_healthy 1 wenn der Health-Check HTTP 200 liefert",
+            "# TYPE cc_bot_healthy gauge",
+            f"cc_bot_healthy {int(not snapshot['problems'])}",
+        ]
+        last_run = snapshot["last_run"]
+        if last_run is not None:
+            mode = _label(last_run["mode"])
+            lines += [
+                "# HELP cc_bot_last_run_success 1 wenn der letzte Lauf erfolgreich war",
+                "# TYPE cc_bot_last_run_success gauge",
+                f'cc_bot_last_run_success{{mode="{mode}"}} {int(bool(last_run["success"]))}',
+            ]
+            if last_run["started_at"]:
+                started = dt.datetime.fromisoformat(last_run["started_at"]).timestamp()
+                lines += [
+                    "# HELP cc_bot_last_run_timestamp_seconds Startzeit des letzten Laufs",
+                    "# TYPE cc_bot_last_run_timestamp_seconds gauge",
+                    f'cc_bot_last_run_timestamp_seconds{{mode="{mode}"}} {started:.0f}',
+                ]
+            if last_run["timings"]:
+                lines += [
+                    "# HELP cc_bot_last_run_phase_seconds Dauer der Ablaufschritte des letzten Laufs",
+                    "# TYPE cc_bot_last_run_phase_seconds gauge",
+                ]
+                lines += [
+                    f'cc_bot_last_run_phase_seconds{{mode="{mode}",phase="{_label(phase)}"}} {seconds}'
+                    for phase, seconds in last_run["timings"].items()
+                ]
+        if snapshot["next_runs"]:
+            lines += [
+                "# HELP cc_bot_next_run_timestamp_seconds Nächster Cron-Auslösezeitpunkt je Modus",
+                "# TYPE cc_bot_next_run_timestamp_seconds gauge",
+            ]
+            lines += [
+                f'cc_bot_next_run_timestamp_seconds{{mode="{_label(run["mode"])}"}} '
+                f'{dt.datetime.fromisoformat(run["at"]).timestamp():.0f}'
+                for run in snapshot["next_runs"]
+            ]
+        if snapshot["holiday_cache_age_s"] is not None:
+            lines += [
+                "# HELP cc_bot_holiday_cache_age_seconds Alter des Feiertags-Caches",
+                "# TYPE cc_bot_holiday_cache_age_seconds gauge",
+                f"cc_bot_holiday_cache_age_seconds {snapshot['holiday_cache_age_s']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _HealthHandler(BaseHTTPRequestHandler):
+    state: HealthState
+
+    def do_GET(self) -> None:  # noqa: N802 - von BaseHTTPRequestHandler vorgegeben
+        path = self.path.split("?", 1)[0]
+        if path in ("/health", "/healthz", "/"):
+            snapshot = self.state.snapshot()
+            status = 503 if snapshot["problems"] else 200
+            self._send(status, "application/json", json.dumps(snapshot, ensure_ascii=False))
+        elif path == "/metrics":
+            self._send(200, METRICS_CONTENT_TYPE, self.state.metrics())
+        else:
+            self._send(404, "text/plain; charset=utf-8", "not found\n")
+
+    def _send(self, status: int, content_type: str, body: str) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Healthchecks im Sekundentakt sollen das Log nicht fluten
+        logging.debug("Health: " + format, *args)
+
+
+def start_health_server(
+    host: str, port: int, artifacts_dir: Path, cron_file: Path, fail_on_last_run: bool = False
+) -> ThreadingHTTPServer:
+    """Startet den Endpunkt in einem Daemon-Thread und liefert den Server zurück."""
+
+    state = HealthState(artifacts_dir, cron_file, fail_on_last_run)
+    handler = type("HealthHandler", (_HealthHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="health", daemon=True)
+    thread.start()
+    logging.info("Health-Endpunkt auf http://%s:%s/health und /metrics", host, server.server_address[1])
+    return server
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Health- und Metrik-Endpunkt")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--artifacts-dir", default="artifacts")
+    parser.add_argument("--cron-file", default="/etc/cron.d/cc-bot")
+    parser.add_argument(
+        "--fail-on-last-run",
+        action="store_true",
+        help="HTTP 503 auch, wenn der letzte Lauf fehlgeschlagen ist",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+
+    server = start_health_server(
+        args.host, args.port, Path(args.artifacts_dir), Path(args.cron_file), args.fail_on_last_run
+    )
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
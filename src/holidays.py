@@ -42,9 +42,9 @@ async def fetch_holidays(page: Page, base_url: str, timeout: float = 30.0) -> li
         # Debug: Zeige alle Zeilen-Inhalte
         try:
             row_text = await row.inner_text()
-            logging.debug(f"Zeile {index}: {row_text[:100]}...")
+            logging.debug("Zeile %s: %s...", index, row_text[:100])
         except:
-            logging.debug(f"Zeile {index}: Fehler beim Lesen")
+            logging.debug("Zeile %s: Fehler beim Lesen", index)
             continue
             
         title_locator = row.locator("td.bold").first
@@ -55,28 +55,28 @@ async def fetch_holidays(page: Page, base_url: str, timeout: float = 30.0) -> li
                 continue
                 
         title = (await title_locator.inner_text()).strip()
-        logging.debug(f"Zeile {index} Titel: '{title}'")
+        logging.debug("Zeile %s Titel: '%s'", index, title)
         
         if "Unterrichtsfreie Zeit" not in title and "unterrichtsfrei" not in title.lower():
             continue
 
         cols = row.locator("td")
         col_count = await cols.count()
-        logging.debug(f"Zeile {index} hat {col_count} Spalten")
+        logging.debug("Zeile %s hat %s Spalten", index, col_count)
         
         if col_count < 4:
-            logging.warning(f"Zeile {index} hat zu wenige Spalten: {col_count}")
+            logging.warning("Zeile %s hat zu wenige Spalten: %s", index, col_count)
             continue
 
         start_raw = (await cols.nth(2).inner_text()).strip()
         end_raw = (await cols.nth(3).inner_text()).strip()
         
-        logging.debug(f"Zeile {index} Daten: '{start_raw}' - '{end_raw}'")
+        logging.debug("Zeile %s Daten: '%s' - '%s'", index, start_raw, end_raw)
 
         try:
             start = dt.datetime.strptime(start_raw, "%d.%m.%Y").date()
             end = dt.datetime.strptime(end_raw, "%d.%m.%Y").date()
-            logging.info(f"Freier Zeitraum gefunden: {start} - {end}")
+            logging.info("Freier Zeitraum gefunden: %s - %s", start, end)
         except ValueError as e:
             logging.warning("Konnte Datum nicht parsen: %s - %s (Fehler: %s)", start_raw, end_raw, e)
             continue
@@ -126,7 +126,7 @@ async def get_holidays_with_cache(page: Page, base_url: str, cache_path: Path, t
     # Filtere nur zukünftige Feiertage
     future_holidays = filter_future_holidays(all_holidays)
     
-    logging.info(f"Gefunden: {len(all_holidays)} Feiertage total, {len(future_holidays)} zukünftige")
+    logging.info("Gefunden: %s Feiertage total, %s zukünftige", len(all_holidays), len(future_holidays))
     
     # Speichere nur zukünftige Feiertage im Cache
     save_holidays(cache_path, future_holidays)
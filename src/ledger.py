@@ -0,0 +1,72 @@
+"""Lokales Ledger des zuletzt bestätigten Kommen/Gehen-Status."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .records import write_json
+
+STATUS_KEYWORDS = {"start": "Kommen", "stop": "Gehen"}
+
+
+@dataclass(slots=True)
+class LedgerEntry:
+    mode: str
+    status_text: str
+    confirmed_at: dt.datetime
+
+
+def confirmed_mode(status_text: str) -> Optional[str]:
+    """Ermittelt den Modus, den der Portalstatus eindeutig bestätigt."""
+    matches = [mode for mode, keyword in STATUS_KEYWORDS.items() if keyword in status_text]
+    return matches[0] if len(matches) == 1 else None
+
+
+def load_entry(path: Path) -> Optional[LedgerEntry]:
+    if not path.exists():
+        return None
+    try:
+        content = json.loads(path.read_text(encoding="utf-8"))
+        return LedgerEntry(
+            mode=content["mode"],
+            status_text=content["status_text"],
+            confirmed_at=dt.datetime.fromisoformat(content["confirmed_at"]),
+        )
+    except (ValueError, KeyError, TypeError) as error:
+        logging.warning("Ledger %s unlesbar, wird ignoriert: %s", path, error)
+        return None
+
+
+def record_status(path: Path, status_text: str, now: Optional[dt.datetime] = None) -> Optional[LedgerEntry]:
+    """Speichert den Status, falls er einen Modus eindeutig bestätigt."""
+    mode = confirmed_mode(status_text)
+    if mode is None:
+        return None
+    entry = LedgerEntry(mode=mode, status_text=status_text, confirmed_at=now or dt.datetime.now())
+    write_json(
+        path,
+        {
+            "mode": entry.mode,
+            "status_text": entry.status_text,
+            "confirmed_at": entry.confirmed_at.isoformat(timespec="seconds"),
+        },
+    )
+    return entry
+
+
+def lookup(
+    path: Path, mode: str, freshness: dt.timedelta, now: Optional[dt.datetime] = None
+) -> Optional[LedgerEntry]:
+    """Liefert den Ledger-Eintrag, wenn er den Modus heute und innerhalb des Frischefensters bestätigt."""
+    entry = load_entry(path)
+    if entry is None or entry.mode != mode:
+        return None
+    now = now or dt.datetime.now()
+    if entry.confirmed_at.date() != now.date() or now - entry.confirmed_at > freshness:
+        return None
+    return entry
@@ -0,0 +1,48 @@
+"""Logging-Konfiguration mit Größenrotation und kompaktem JSON-Zeilenformat."""
+
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+from pathlib import Path
+from typing import Optional
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Eine kompakte JSON-Zeile pro Logeintrag."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "lvl": record.levelname,
+            "log": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+def configure_logging(
+    level: str,
+    log_file: Optional[str] = None,
+    log_format: str = "text",
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 3,
+) -> None:
+    """Loggt auf stderr oder, falls `log_file` gesetzt ist, in eine rotierende Datei."""
+
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        handler: logging.Handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+    else:
+        handler = logging.StreamHandler()
+    handler.setFormatter(JsonLineFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    logging.basicConfig(level=level, handlers=[handler], force=True)
+    # python-telegram-bot protokolliert sonst jeden HTTP-Request auf INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
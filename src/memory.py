@@ -0,0 +1,100 @@
+"""Messung des Speicherbedarfs (RSS) des Browser-Prozessbaums über /proc."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+PROC = Path("/proc")
+# Der Playwright-Treiber (node) gehört nicht zum Browser und wird nicht mitgezählt
+EXCLUDED_COMMANDS = {"node"}
+
+
+def _read_stat(pid: int) -> Optional[tuple[str, int]]:
+    try:
+        raw = (PROC / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    # Format: pid (comm) state ppid ...; comm kann Leerzeichen enthalten
+    comm_end = raw.rfind(")")
+    comm = raw[raw.find("(") + 1 : comm_end]
+    fields = raw[comm_end + 2 :].split()
+    return comm, int(fields[1])
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        for line in (PROC / str(pid) / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def browser_tree_rss(root_pid: Optional[int] = None) -> int:
+    """Summiert die RSS aller Nachfahren von `root_pid` (ohne Playwright-Treiber)."""
+
+    root_pid = root_pid or os.getpid()
+    children: dict[int, list[int]] = {}
+    commands: dict[int, str] = {}
+    for entry in PROC.iterdir():
+        if not entry.name.isdigit():
+            continue
+        stat = _read_stat(int(entry.name))
+        if stat is None:
+            continue
+        commands[int(entry.name)] = stat[0]
+        children.setdefault(stat[1], []).append(int(entry.name))
+
+    total = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if commands.get(pid) not in EXCLUDED_COMMANDS:
+            total += _rss_bytes(pid)
+    return total
+
+
+class RssSampler:
+    """Tastet die RSS des Browser-Prozessbaums periodisch ab und merkt sich den Spitzenwert."""
+
+    def __init__(self, interval: float = 0.5) -> None:
+        self.interval = interval
+        self.peak_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def available(self) -> bool:
+        return PROC.is_dir()
+
+    def sample(self) -> None:
+        try:
+            self.peak_bytes = max(self.peak_bytes, browser_tree_rss())
+        except OSError as error:  # pragma: no cover - /proc nicht lesbar
+            logging.debug("RSS-Messung fehlgeschlagen: %s", error)
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.available:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> Optional[float]:
+        """Beendet die Messung und liefert den Spitzenwert in MB (None ohne /proc)."""
+        if self._task is None:
+            return None
+        self.sample()
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        return round(self.peak_bytes / (1024 * 1024), 1)
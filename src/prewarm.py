@@ -0,0 +1,102 @@
+"""Vorwärmen des Browsers, damit der Kommen/Gehen-Klick zur geplanten Zeit erfolgt."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .records import write_json
+
+PREPARE_PHASE = "prepare"
+
+
+async def wait_until(target: dt.datetime) -> None:
+    """Schläft in Abschnitten bis `target`, damit Uhrkorrekturen berücksichtigt werden."""
+    while True:
+        remaining = (target - dt.datetime.now(target.tzinfo)).total_seconds()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(remaining, 30.0))
+
+
+class PhaseEstimator:
+    """Gleitender Mittelwert (EWMA) der Phasendauern vergangener Läufe."""
+
+    def __init__(self, path: Path, alpha: float = 0.3) -> None:
+        self.path = path
+        self.alpha = alpha
+        self._values: dict[str, float] = {}
+        if path.exists():
+            try:
+                self._values = {
+                    key: float(value)
+                    for key, value in json.loads(path.read_text(encoding="utf-8")).items()
+                }
+            except (ValueError, AttributeError) as error:
+                logging.warning("Phasenschätzung %s unlesbar, starte neu: %s", path, error)
+
+    def estimate(self, phase: str, default: float) -> float:
+        return self._values.get(phase, default)
+
+    def update(self, phase: str, seconds: float) -> None:
+        previous = self._values.get(phase)
+        value = seconds if previous is None else self.alpha * seconds + (1 - self.alpha) * previous
+        self._values[phase] = round(value, 3)
+        write_json(self.path, self._values)
+
+
+@dataclass(slots=True)
+class ClickSchedule:
+    planned_at: Optional[dt.datetime] = None
+    started_at: Optional[dt.datetime] = None
+    ready_at: Optional[dt.datetime] = None
+    clicked_at: Optional[dt.datetime] = None
+    held_seconds: float = 0.0
+
+    def _now(self) -> dt.datetime:
+        return dt.datetime.now(self.planned_at.tzinfo if self.planned_at else None)
+
+    def start(self) -> None:
+        self.started_at = self._now()
+
+    @property
+    def prepare_seconds(self) -> Optional[float]:
+        """Dauer von Browserstart bis Klickbereitschaft (Basis der Schätzung)."""
+        if self.started_at is None or self.ready_at is None:
+            return None
+        return round((self.ready_at - self.started_at).total_seconds(), 3)
+
+    async def hold(self) -> None:
+        """Markiert den Bereitschaftszustand und wartet bis zur geplanten Klickzeit."""
+        self.ready_at = self._now()
+        if self.planned_at is None:
+            return
+        slack = (self.planned_at - self.ready_at).total_seconds()
+        if slack > 0:
+            logging.info(
+                "Bereit %.1f s vor der geplanten Zeit – halte bis %s",
+                slack,
+                self.planned_at.strftime("%H:%M:%S"),
+            )
+            await wait_until(self.planned_at)
+            self.held_seconds = round((self._now() - self.ready_at).total_seconds(), 3)
+        else:
+            logging.warning("Bereitschaft %.1f s nach der geplanten Zeit – klicke sofort", -slack)
+
+    def mark_clicked(self) -> None:
+        self.clicked_at = self._now()
+
+    def to_details(self) -> dict[str, object]:
+        details: dict[str, object] = {}
+        if self.planned_at is not None:
+            details["click_planned"] = self.planned_at.isoformat(timespec="milliseconds")
+        if self.clicked_at is not None:
+            details["click_actual"] = self.clicked_at.isoformat(timespec="milliseconds")
+        if self.planned_at is not None and self.clicked_at is not None:
+            details["click_offset_s"] = round((self.clicked_at - self.planned_at).total_seconds(), 3)
+        return details
@@ -0,0 +1,53 @@
+"""Laufprotokolle (Run-Records) für einzelne Botläufe."""
+
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+
+@dataclass(slots=True)
+class RunRecord:
+    mode: str
+    path: Path
+    started_at: dt.datetime = field(default_factory=dt.datetime.now)
+    success: Optional[bool] = None
+    status_text: str = ""
+    timings: dict[str, float] = field(default_factory=dict)
+    details: dict[str, Any] = field(default_factory=dict)
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Misst die Dauer eines Ablaufschritts in Sekunden."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(time.perf_counter() - started, 3)
+
+    def sibling(self, suffix: str) -> Path:
+        """Pfad für eine Zusatzdatei neben dem Run-Record."""
+        return self.path.with_name(f"{self.path.stem}_{suffix}.json")
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "success": self.success,
+            "status_text": self.status_text,
+            "timings": self.timings,
+            "details": self.details,
+        }
+
+    def write(self) -> None:
+        write_json(self.path, self.to_dict())
+
+
+def write_json(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
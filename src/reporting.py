@@ -0,0 +1,119 @@
+"""Änderungsbasierte Telegram-Berichte und Tageszusammenfassung."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .ledger import confirmed_mode
+from .records import write_json
+
+REPORT_POLICIES = ("always", "changes", "quiet")
+DIGEST_KEEP_DAYS = 7
+
+
+@dataclass(slots=True)
+class ReportDecision:
+    send: bool
+    photo: bool
+    reason: str
+
+
+def _state_key(status_text: str) -> str:
+    # Statustexte enthalten Uhrzeiten; verglichen wird der bestätigte Zustand
+    return confirmed_mode(status_text) or status_text.strip()
+
+
+def _load_state(path: Path) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        logging.warning("Berichtsstatus %s unlesbar, wird ignoriert", path)
+        return {}
+
+
+def decide_report(
+    state_path: Path,
+    policy: str,
+    success: bool,
+    status_text: str,
+    now: Optional[dt.datetime] = None,
+    warning: bool = False,
+) -> ReportDecision:
+    """Foto nur bei Statuswechsel, Fehler, Warnung oder erstem Lauf des Tages, sonst eine Textzeile."""
+
+    if policy == "always":
+        # Bisheriges Verhalten: Foto bei Erfolg, Fehler nur als Text
+        return ReportDecision(send=True, photo=success, reason="immer")
+    if not success:
+        return ReportDecision(send=True, photo=True, reason="Fehler")
+    if warning:
+        return ReportDecision(send=True, photo=True, reason="Warnung")
+
+    now = now or dt.datetime.now()
+    state = _load_state(state_path)
+    if state.get("last_photo_date") != now.date().isoformat():
+        return ReportDecision(send=True, photo=True, reason="erster Lauf des Tages")
+    if state.get("last_state") != _state_key(status_text):
+        return ReportDecision(send=True, photo=True, reason="Statuswechsel")
+    return ReportDecision(send=policy != "quiet", photo=False, reason="unverändert")
+
+
+def remember_report(
+    state_path: Path,
+    success: bool,
+    status_text: str,
+    photo_sent: bool,
+    now: Optional[dt.datetime] = None,
+) -> None:
+    now = now or dt.datetime.now()
+    state = _load_state(state_path)
+    if success:
+        state["last_state"] = _state_key(status_text)
+    if photo_sent:
+        state["last_photo_date"] = now.date().isoformat()
+    write_json(state_path, state)
+
+
+def _digest_path(directory: Path, day: dt.date) -> Path:
+    return directory / f"digest_{day.strftime('%Y%m%d')}.jsonl"
+
+
+def append_digest(
+    directory: Path,
+    mode: str,
+    success: bool,
+    status_text: str,
+    now: Optional[dt.datetime] = None,
+) -> None:
+    """Hängt den Lauf an das Tagesprotokoll an und entfernt alte Protokolle."""
+
+    now = now or dt.datetime.now()
+    directory.mkdir(parents=True, exist_ok=True)
+    entry = {"time": now.strftime("%H:%M:%S"), "mode": mode, "success": success, "status": status_text}
+    with _digest_path(directory, now.date()).open("a", encoding="utf-8") as file:
+        file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    cutoff = _digest_path(directory, now.date() - dt.timedelta(days=DIGEST_KEEP_DAYS)).name
+    for path in directory.glob("digest_*.jsonl"):
+        if path.name < cutoff:
+            path.unlink(missing_ok=True)
+
+
+def build_digest(directory: Path, day: dt.date) -> Optional[str]:
+    path = _digest_path(directory, day)
+    if not path.exists():
+        return None
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+    failures = sum(1 for entry in entries if not entry["success"])
+    lines = [f"📋 Tageszusammenfassung {day.strftime('%d.%m.%Y')}: {len(entries)} Läufe, {failures} Fehler"]
+    for entry in entries:
+        icon = "✅" if entry["success"] else "❌"
+        lines.append(f"{icon} {entry['time']} {entry['mode']}: {entry['status']}")
+    return "\n".join(lines)
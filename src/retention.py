@@ -0,0 +1,228 @@
+"""Aufräumen von Artefakten (Screenshots, Run-Records, Fehlerpakete)."""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import os
+import re
+import shutil
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+try:  # Optional: nur für das Umkodieren von Screenshots benötigt
+    from PIL import Image
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    Image = None
+
+RUN_FILE_PATTERN = re.compile(r"^status_(\d{8}_\d{6})")
+ARCHIVE_PATTERN = re.compile(r"^status_(\d{6})\.zip$")
+COMPACT_SUFFIX = ".webp"
+
+
+@dataclass(slots=True)
+class RetentionPolicy:
+    max_age_days: Optional[int] = None
+    max_count: Optional[int] = None
+    max_bytes: Optional[int] = None
+    compact: bool = False
+    archive_after_days: Optional[int] = None
+    dry_run: bool = False
+
+
+@dataclass(slots=True)
+class RetentionResult:
+    deleted: list[Path] = field(default_factory=list)
+    compacted: list[Path] = field(default_factory=list)
+    archived: list[Path] = field(default_factory=list)
+    freed_bytes: int = 0
+
+
+@dataclass(slots=True)
+class _RunGroup:
+    key: str
+    timestamp: dt.datetime
+    files: list[tuple[Path, int]] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size in self.files)
+
+
+def _entry_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+    return path.stat().st_size
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def prune_bundles(directory: Path, *, max_count: int, max_bytes: int) -> list[Path]:
+    """Behält die neuesten Einträge, solange Anzahl und Gesamtgröße im Rahmen bleiben.
+
+    Der neueste Eintrag bleibt immer erhalten, auch wenn er allein `max_bytes` überschreitet.
+    """
+
+    if not directory.exists():
+        return []
+
+    entries = sorted(directory.iterdir(), key=lambda item: item.stat().st_mtime, reverse=True)
+    removed: list[Path] = []
+    total = 0
+    for index, entry in enumerate(entries):
+        total += _entry_size(entry)
+        if index >= max_count or (index > 0 and total > max_bytes):
+            _remove(entry)
+            removed.append(entry)
+    if removed:
+        logging.info("%s alte Fehlerpakete in %s entfernt", len(removed), directory)
+    return removed
+
+
+def _collect_runs(directory: Path) -> list[_RunGroup]:
+    """Gruppiert alle Dateien eines Laufs (Screenshot, Run-Record, Zusatzdateien), neueste zuerst."""
+
+    groups: dict[str, _RunGroup] = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            match = RUN_FILE_PATTERN.match(entry.name)
+            if not match or not entry.is_file():
+                continue
+            key = match.group(1)
+            group = groups.get(key)
+            if group is None:
+                timestamp = dt.datetime.strptime(key, "%Y%m%d_%H%M%S")
+                group = groups[key] = _RunGroup(key, timestamp)
+            group.files.append((Path(entry.path), entry.stat().st_size))
+    return sorted(groups.values(), key=lambda group: group.timestamp, reverse=True)
+
+
+def _compact_screenshot(path: Path) -> Path:
+    target = path.with_suffix(COMPACT_SUFFIX)
+    with Image.open(path) as image:
+        image.save(target, "WEBP", quality=80, method=4)
+    path.unlink()
+    return target
+
+
+def _archive_groups(directory: Path, month: str, groups: list[_RunGroup]) -> Path:
+    archive_path = directory / f"status_{month}.zip"
+    # Screenshots sind bereits komprimiert, JSON lohnt sich zu deflaten
+    with zipfile.ZipFile(archive_path, "a") as archive:
+        existing = set(archive.namelist())
+        for group in groups:
+            for path, _ in group.files:
+                if path.name not in existing:
+                    compression = zipfile.ZIP_DEFLATED if path.suffix == ".json" else zipfile.ZIP_STORED
+                    archive.write(path, path.name, compress_type=compression)
+    for group in groups:
+        for path, _ in group.files:
+            path.unlink()
+    return archive_path
+
+
+def apply_retention(
+    directory: Path, policy: RetentionPolicy, now: Optional[dt.datetime] = None
+) -> RetentionResult:
+    """Wendet Alter-, Anzahl- und Größenlimits auf die Laufartefakte in `directory` an.
+
+    Danach werden optional die verbleibenden PNG-Screenshots umkodiert und ältere Läufe
+    in Monatsarchive (`status_YYYYMM.zip`) verschoben. Mit `dry_run` wird nur geplant.
+    """
+
+    result = RetentionResult()
+    if not directory.is_dir():
+        return result
+
+    now = now or dt.datetime.now()
+    runs = _collect_runs(directory)
+    kept: list[_RunGroup] = []
+    total = 0
+    for index, group in enumerate(runs):
+        # Wie in prune_bundles wächst die Summe über alle Läufe: ist das Limit einmal
+        # erreicht, fallen auch alle älteren (kleineren) Läufe weg
+        total += group.size
+        too_old = policy.max_age_days is not None and (now - group.timestamp).days >= policy.max_age_days
+        too_many = policy.max_count is not None and index >= policy.max_count
+        too_big = policy.max_bytes is not None and index > 0 and total > policy.max_bytes
+        if too_old or too_many or too_big:
+            result.deleted.extend(path for path, _ in group.files)
+            result.freed_bytes += group.size
+            continue
+        kept.append(group)
+
+    if policy.max_age_days is not None:
+        cutoff_month = (now - dt.timedelta(days=policy.max_age_days)).strftime("%Y%m")
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                match = ARCHIVE_PATTERN.match(entry.name)
+                if match and match.group(1) < cutoff_month:
+                    result.deleted.append(Path(entry.path))
+                    result.freed_bytes += entry.stat().st_size
+
+    archive_groups: list[_RunGroup] = []
+    if policy.archive_after_days is not None:
+        archive_groups = [
+            group for group in kept if (now - group.timestamp).days >= policy.archive_after_days
+        ]
+
+    compact_candidates: list[Path] = []
+    if policy.compact:
+        if Image is None:
+            logging.warning("Pillow nicht installiert – Screenshots werden nicht umkodiert")
+        else:
+            compact_candidates = [
+                path for group in kept for path, _ in group.files if path.suffix == ".png"
+            ]
+
+    if policy.dry_run:
+        result.compacted = compact_candidates
+        result.archived = [path for group in archive_groups for path, _ in group.files]
+        logging.info(
+            "Retention (Probelauf) in %s: %s löschen (%s Bytes), %s umkodieren, %s archivieren",
+            directory,
+            len(result.deleted),
+            result.freed_bytes,
+            len(result.compacted),
+            len(result.archived),
+        )
+        return result
+
+    for path in result.deleted:
+        _remove(path)
+
+    for path in compact_candidates:
+        try:
+            result.compacted.append(_compact_screenshot(path))
+        except OSError as error:
+            logging.warning("Konnte %s nicht umkodieren: %s", path, error)
+
+    by_month: dict[str, list[_RunGroup]] = {}
+    for group in archive_groups:
+        # Nach dem Umkodieren haben sich ggf. Dateinamen geändert
+        group.files = [
+            (path if path.exists() else path.with_suffix(COMPACT_SUFFIX), size)
+            for path, size in group.files
+        ]
+        result.archived.extend(path for path, _ in group.files)
+        by_month.setdefault(group.timestamp.strftime("%Y%m"), []).append(group)
+    for month, groups in by_month.items():
+        _archive_groups(directory, month, groups)
+
+    if result.deleted or result.compacted or result.archived:
+        logging.info(
+            "Retention in %s: %s gelöscht (%s Bytes), %s umkodiert, %s archiviert",
+            directory,
+            len(result.deleted),
+            result.freed_bytes,
+            len(result.compacted),
+            len(result.archived),
+        )
+    return result
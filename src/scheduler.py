@@ -3,16 +3,23 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import logging
+import os
 import shlex
 import subprocess
 import sys
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from .health import start_health_server
+
 
 DEFAULT_START_TIME = "13:20"
 DEFAULT_END_TIME = "17:30"
+PREWARM_LEAD_MINUTES = 1
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -32,8 +39,11 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--log-file",
         default="/var/log/cc-bot.log",
-        help="Pfad für Cron-Logausgaben",
+        help="Rotierende Logdatei der Botläufe",
     )
+    parser.add_argument("--log-format", choices=["text", "json"], default="json")
+    parser.add_argument("--log-max-mb", type=float, default=5.0)
+    parser.add_argument("--log-backups", type=int, default=3)
     parser.add_argument(
         "--disable-variation",
         action="store_true",
@@ -44,6 +54,67 @@ def build_parser() -> argparse.ArgumentParser:
         default="UTC",
         help="Zeitzone für Zeitberechnungen (z.B. UTC, Europe/Berlin, CET)",
     )
+    parser.add_argument(
+        "--launch-profile",
+        choices=["default", "lean"],
+        default="default",
+        help="Browser-Startprofil für die CLI (default oder lean)",
+    )
+    parser.add_argument(
+        "--report-policy",
+        choices=["always", "changes", "quiet"],
+        default="changes",
+        help="Telegram-Berichtsrichtlinie der Cron-Läufe",
+    )
+    parser.add_argument(
+        "--daily-digest",
+        action="store_true",
+        help="Der Gehen-Lauf sendet zusätzlich eine Tageszusammenfassung",
+    )
+    parser.add_argument(
+        "--workdir",
+        default=os.getcwd(),
+        help="Arbeitsverzeichnis der Cron-Läufe (gemeinsame artifacts/ für alle Läufe)",
+    )
+    parser.add_argument(
+        "--boot",
+        action="store_true",
+        help="Containerstart: Cron sofort schreiben, Login-Selbsttest im Hintergrund",
+    )
+    parser.add_argument(
+        "--no-self-test",
+        dest="self_test",
+        action="store_false",
+        default=True,
+        help="Überspringt den Login-Selbsttest beim Boot",
+    )
+    parser.add_argument(
+        "--self-test-cache",
+        default="artifacts/selftest.json",
+        help="Cache erfolgreicher Selbsttests (pro Credentials-Hash und Host)",
+    )
+    parser.add_argument(
+        "--self-test-max-age-hours",
+        type=float,
+        default=24.0,
+        help="So lange gilt ein erfolgreicher Selbsttest als aktuell",
+    )
+    parser.add_argument(
+        "--health-port",
+        type=int,
+        default=0,
+        help="Port des Health-/Metrik-Endpunkts (0 = deaktiviert)",
+    )
+    parser.add_argument(
+        "--health-host",
+        default="127.0.0.1",
+        help="Bind-Adresse des Health-Endpunkts (0.0.0.0 für Prometheus von außen)",
+    )
+    parser.add_argument(
+        "--health-fail-on-last-run",
+        action="store_true",
+        help="Health-Check meldet auch einen fehlgeschlagenen letzten Lauf als unhealthy",
+    )
     return parser
 
 
@@ -59,6 +130,11 @@ def write_cron_file(
     log_file: str,
     enable_variation: bool,
     timezone: str = "UTC",
+    launch_profile: str = "default",
+    log_options: dict[str, str] | None = None,
+    workdir: str | None = None,
+    report_policy: str = "changes",
+    daily_digest: bool = False,
 ) -> None:
     cron_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -67,8 +143,10 @@ def write_cron_file(
         "PATH=/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin",
     ]
 
-    start_trigger = _calculate_trigger_time(start_time, variation_minutes)
-    end_trigger = _calculate_trigger_time(end_time, variation_minutes)
+    # Eine Minute Puffer, damit die CLI den Browser vor der frühestmöglichen Zielzeit vorwärmen kann
+    lead_minutes = PREWARM_LEAD_MINUTES if enable_variation else 0
+    start_trigger = _calculate_trigger_time(start_time, variation_minutes + lead_minutes)
+    end_trigger = _calculate_trigger_time(end_time, variation_minutes + lead_minutes)
 
     start_cmd = _build_cron_command(
         python_bin,
@@ -82,6 +160,11 @@ def write_cron_file(
         enable_variation,
         start_trigger,
         timezone,
+        launch_profile,
+        log_options,
+        workdir,
+        report_policy,
+        daily_digest,
     )
     stop_cmd = _build_cron_command(
         python_bin,
@@ -95,6 +178,11 @@ def write_cron_file(
         enable_variation,
         end_trigger,
         timezone,
+        launch_profile,
+        log_options,
+        workdir,
+        report_policy,
+        daily_digest,
     )
 
     cron_lines.extend([start_cmd, stop_cmd, ""])
@@ -117,6 +205,11 @@ def _build_cron_command(
     enable_variation: bool,
     trigger_time: str,
     timezone: str = "UTC",
+    launch_profile: str = "default",
+    log_options: dict[str, str] | None = None,
+    workdir: str | None = None,
+    report_policy: str = "changes",
+    daily_digest: bool = False,
 ) -> str:
     hour, minute = trigger_time.split(":")
     cron_schedule = f"{minute} {hour} * * {workdays}"
@@ -148,8 +241,25 @@ def _build_cron_command(
     if enable_variation:
         cli_parts.append("--apply-variation")
 
+    if launch_profile != "default":
+        cli_parts.extend(["--launch-profile", launch_profile])
+
+    cli_parts.extend(["--report-policy", report_policy])
+    if daily_digest and mode == "stop":
+        # Der letzte Lauf des Tages fasst alle Läufe zusammen
+        cli_parts.append("--digest")
+
+    cli_parts.extend(["--log-file", log_file])
+    for option, value in (log_options or {}).items():
+        cli_parts.extend([f"--{option}", value])
+
+    # Die CLI rotiert ihr Log selbst; die Rohausgabe (z. B. Abstürze vor dem
+    # Logging-Setup) wird pro Lauf überschrieben und bleibt dadurch klein.
     command = shlex.join(cli_parts)
-    return f"{cron_schedule} root {command} >> {shlex.quote(log_file)} 2>&1"
+    if workdir:
+        # Cron startet im Home-Verzeichnis; Caches, Ledger und Lock sollen geteilt werden
+        command = f"cd {shlex.quote(workdir)} && {command}"
+    return f"{cron_schedule} root {command} > {shlex.quote(log_file + '.stderr')} 2>&1"
 
 
 def _calculate_trigger_time(time_str: str, variation: int) -> str:
@@ -162,6 +272,83 @@ def _calculate_trigger_time(time_str: str, variation: int) -> str:
     return f"{trigger_hour:02d}:{trigger_minute:02d}"
 
 
+def _self_test_key(cred_args: dict[str, str]) -> str:
+    digest = hashlib.sha256(
+        f"{cred_args['username']}\0{cred_args['password']}".encode("utf-8")
+    ).hexdigest()
+    return f"{digest[:16]}@{cred_args['host']}"
+
+
+def _load_self_test_cache(cache_path: Path) -> dict[str, str]:
+    if not cache_path.exists():
+        return {}
+    try:
+        return json.loads(cache_path.read_text(encoding="utf-8"))
+    except ValueError:
+        logging.warning("Selbsttest-Cache %s unlesbar, wird ignoriert", cache_path)
+        return {}
+
+
+def self_test_is_recent(cache_path: Path, key: str, max_age: timedelta) -> bool:
+    passed_at = _load_self_test_cache(cache_path).get(key)
+    if not passed_at:
+        return False
+    return datetime.now() - datetime.fromisoformat(passed_at) < max_age
+
+
+def _mark_self_test_passed(cache_path: Path, key: str) -> None:
+    cache = _load_self_test_cache(cache_path)
+    cache[key] = datetime.now().isoformat(timespec="seconds")
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+
+
+def _run_self_test(command: list[str], cache_path: Path, key: str) -> None:
+    logging.info("Starte Login-Selbsttest im Hintergrund")
+    result = subprocess.run(command, check=False)
+    if result.returncode == 0:
+        _mark_self_test_passed(cache_path, key)
+        logging.info("Login-Selbsttest erfolgreich - Bot ist bereit")
+    else:
+        logging.warning(
+            "Login-Selbsttest fehlgeschlagen (Exit-Code %s) - bitte Credentials und Hostname prüfen",
+            result.returncode,
+        )
+
+
+def start_boot_self_test(args: argparse.Namespace, cred_args: dict[str, str]) -> threading.Thread | None:
+    """Startet den Selbsttest nebenläufig, sofern kein aktueller erfolgreicher Test vorliegt."""
+    cache_path = Path(args.self_test_cache)
+    key = _self_test_key(cred_args)
+    if self_test_is_recent(cache_path, key, timedelta(hours=args.self_test_max_age_hours)):
+        logging.info("Login-Selbsttest übersprungen - letzter erfolgreicher Test ist aktuell")
+        return None
+
+    command = [args.python_bin] + args.script.split() + [
+        "--mode",
+        "test",
+        "--username",
+        cred_args["username"],
+        "--password",
+        cred_args["password"],
+        "--bot-token",
+        cred_args["bot_token"],
+        "--chat-id",
+        cred_args["chat_id"],
+        "--host",
+        cred_args["host"],
+        "--timezone",
+        args.timezone,
+    ]
+    if args.launch_profile != "default":
+        command.extend(["--launch-profile", args.launch_profile])
+    thread = threading.Thread(
+        target=_run_self_test, args=(command, cache_path, key), name="self-test", daemon=True
+    )
+    thread.start()
+    return thread
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
@@ -190,8 +377,29 @@ def main(argv: list[str] | None = None) -> int:
         args.log_file,
         not args.disable_variation,
         args.timezone,
+        args.launch_profile,
+        {
+            "log-format": args.log_format,
+            "log-max-mb": str(args.log_max_mb),
+            "log-backups": str(args.log_backups),
+        },
+        args.workdir,
+        args.report_policy,
+        args.daily_digest,
     )
 
+    if args.boot and args.self_test:
+        start_boot_self_test(args, cred_args)
+
+    if args.health_port:
+        start_health_server(
+            args.health_host,
+            args.health_port,
+            Path(args.workdir) / "artifacts",
+            cron_path,
+            args.health_fail_on_last_run,
+        )
+
     logging.info("Starte Cron im Vordergrund")
     subprocess.run(["cron", "-f"], check=True)
     return 0
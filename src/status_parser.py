@@ -0,0 +1,83 @@
+"""Auslesen des Zeiterfassungsstatus direkt aus dem HTML einer Navigationsantwort."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Optional
+
+STATUS_KEYWORDS = ("Kommen", "Gehen")
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+# Entspricht der Reihenfolge der DOM-Selektoren in src.bot (STATUS_SELECTORS)
+STATUS_SCOPES: tuple[tuple[str, str], ...] = (
+    ("id", "zeiterfassungdetailscontainer"),
+    ("class", "zeiterfassung"),
+    ("id", "status"),
+    ("any", ""),
+)
+
+
+@dataclass(slots=True)
+class _Paragraph:
+    scopes: set[tuple[str, str]]
+    parts: list[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return " ".join("".join(self.parts).split())
+
+
+class _ParagraphCollector(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._stack: list[tuple[str, set[tuple[str, str]]]] = []
+        self._current: Optional[_Paragraph] = None
+        self.paragraphs: list[_Paragraph] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag in VOID_TAGS:
+            if tag == "br" and self._current is not None:
+                self._current.parts.append(" ")
+            return
+        if tag == "p" and self._current is not None:
+            # Nicht geschlossenes <p> wird vom nächsten <p> implizit beendet
+            self.handle_endtag("p")
+        scopes: set[tuple[str, str]] = set()
+        for name, value in attrs:
+            if name == "id" and value:
+                scopes.add(("id", value))
+            elif name == "class" and value:
+                scopes.update(("class", item) for item in value.split())
+        self._stack.append((tag, scopes))
+        if tag == "p":
+            active = {("any", "")}
+            for _, element_scopes in self._stack:
+                active.update(element_scopes)
+            self._current = _Paragraph(active)
+            self.paragraphs.append(self._current)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "p":
+            self._current = None
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                del self._stack[index:]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._current is not None:
+            self._current.parts.append(data)
+
+
+def parse_status(html: str) -> Optional[str]:
+    """Liefert den ersten Statustext mit Kommen/Gehen analog zur DOM-Selektorreihenfolge."""
+
+    collector = _ParagraphCollector()
+    collector.feed(html)
+    collector.close()
+    for scope in STATUS_SCOPES:
+        first = next((p for p in collector.paragraphs if scope in p.scopes), None)
+        if first is not None and any(keyword in first.text for keyword in STATUS_KEYWORDS):
+            return first.text
+    return None
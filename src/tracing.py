@@ -0,0 +1,119 @@
+"""Optionales Netzwerk-Tracing pro Portal-Navigation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from playwright.async_api import Page, Request
+
+
+@dataclass(slots=True)
+class NavigationStats:
+    label: str
+    url: str
+    requests: int = 0
+    failed: int = 0
+    bytes: int = 0
+    ttfb_ms: Optional[float] = None
+    durations: list[tuple[float, str]] = field(default_factory=list)
+
+    def to_dict(self, slowest: int) -> dict[str, Any]:
+        top = sorted(self.durations, reverse=True)[:slowest]
+        return {
+            "label": self.label,
+            "url": self.url,
+            "requests": self.requests,
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "ttfb_ms": self.ttfb_ms,
+            "slowest": [{"url": url, "ms": ms} for ms, url in top],
+        }
+
+
+class NetworkTracer:
+    """Sammelt Requests über `requestfinished`/`requestfailed` und ordnet sie Navigationen zu."""
+
+    def __init__(self, labels: dict[str, str], slowest: int = 5) -> None:
+        self._labels = labels
+        self._slowest = slowest
+        self._navigations: list[NavigationStats] = []
+        self._current: dict[Page, NavigationStats] = {}
+        self._by_request: dict[Request, NavigationStats] = {}
+        self._pending: set[asyncio.Task] = set()
+
+    def attach(self, page: Page) -> None:
+        page.on("request", lambda request: self._on_request(page, request))
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+
+    def _label_for(self, url: str) -> str:
+        for label, path in self._labels.items():
+            if path in url:
+                return label
+        return "other"
+
+    def _on_request(self, page: Page, request: Request) -> None:
+        try:
+            is_main_navigation = request.is_navigation_request() and request.frame == page.main_frame
+        except Exception:  # pragma: no cover - Frame bereits getrennt
+            is_main_navigation = False
+        if is_main_navigation:
+            stats = NavigationStats(self._label_for(request.url), request.url)
+            self._navigations.append(stats)
+            self._current[page] = stats
+        # Requests werden der laufenden Navigation ihrer eigenen Seite zugeordnet
+        current = self._current.get(page)
+        if current is not None:
+            self._by_request[request] = current
+
+    def _on_finished(self, request: Request) -> None:
+        stats = self._by_request.pop(request, None)
+        if stats is None:
+            return
+        stats.requests += 1
+        timing = request.timing
+        duration = timing.get("responseEnd", -1)
+        if duration >= 0:
+            stats.durations.append((round(duration, 1), request.url))
+        if request.url == stats.url and stats.ttfb_ms is None:
+            response_start = timing.get("responseStart", -1)
+            if response_start >= 0:
+                stats.ttfb_ms = round(response_start, 1)
+        task = asyncio.ensure_future(self._add_sizes(stats, request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _on_failed(self, request: Request) -> None:
+        stats = self._by_request.pop(request, None)
+        if stats is None:
+            return
+        stats.requests += 1
+        stats.failed += 1
+        logging.debug("Request fehlgeschlagen: %s (%s)", request.url, request.failure)
+
+    async def _add_sizes(self, stats: NavigationStats, request: Request) -> None:
+        try:
+            sizes = await request.sizes()
+        except Exception:  # pragma: no cover - Seite bereits geschlossen
+            return
+        stats.bytes += max(0, sizes.get("responseBodySize", 0)) + max(0, sizes.get("responseHeadersSize", 0))
+
+    async def summary(self) -> list[dict[str, Any]]:
+        """Wartet ausstehende Größenabfragen ab und liefert die Zusammenfassung."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        result = [stats.to_dict(self._slowest) for stats in self._navigations]
+        for entry in result:
+            logging.debug(
+                "Netzwerk %s: %s Requests (%s fehlgeschlagen), %s Bytes, TTFB %s ms, langsamste: %s",
+                entry["label"],
+                entry["requests"],
+                entry["failed"],
+                entry["bytes"],
+                entry["ttfb_ms"],
+                ", ".join(f"{item['url']} ({item['ms']} ms)" for item in entry["slowest"]),
+            )
+        return result
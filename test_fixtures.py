@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Tests der Fixture-Bereinigung (Zugangs- und Personendaten)."""
+
+from src.fixtures import request_key, sanitize_html
+
+SECRETS = ["max.user", "Geheim!123", "Max Mustermann"]
+
+
+def test_credentials_and_personal_data_are_removed():
+    html = (
+        "<p>Willkommen Max Mustermann, geb. 01.02.1990, Matrikel 123456</p>"
+        "<p>Kontakt: max.mustermann@example.com, Login max.user</p>"
+        "<script>var pw = 'Geheim!123';</script>"
+    )
+    sanitized = sanitize_html(html, SECRETS)
+    for leaked in ("Max Mustermann", "01.02.1990", "123456", "max.mustermann@", "max.user", "Geheim!123"):
+        assert leaked not in sanitized
+    assert "Matrikel 000000" in sanitized
+
+
+def test_hidden_and_password_inputs_are_emptied():
+    html = (
+        '<input type="hidden" name="csrf" value="abc123">'
+        "<input value='s3cret' name=\"pw\" type=\"password\">"
+        '<input type="text" name="q" value="sichtbar">'
+    )
+    sanitized = sanitize_html(html, [])
+    assert "abc123" not in sanitized and "s3cret" not in sanitized
+    assert 'value="sichtbar"' in sanitized
+
+
+def test_session_ids_match_manifest_keys():
+    url = "https://portal.example/index.php?cmd=kug&sid=9f8e7d6c&PHPSESSID=abc"
+    html = sanitize_html(f'<a href="{url}">Zeiterfassung</a>', [])
+    assert "9f8e7d6c" not in html and "PHPSESSID=abc" not in html
+
+    key = request_key("get", url)
+    assert key == "GET /index.php?cmd=kug&sid=redacted&PHPSESSID=redacted"
+    # Links im bereinigten HTML führen beim Replay auf denselben Schlüssel
+    linked = html.split('href="')[1].split('"')[0]
+    assert request_key("GET", linked) == key
+
+
+def test_holiday_dates_are_kept():
+    html = "<td>Weihnachtsferien</td><td>23.12.2025 - 02.01.2026</td>"
+    assert sanitize_html(html, SECRETS) == html
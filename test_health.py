@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Tests des Health-Endpunkts auf einer synthetischen Cron-Datei."""
+
+import datetime as dt
+import json
+
+from src.health import HealthState, parse_cron_entries
+from src.scheduler import write_cron_file
+
+CRED_ARGS = {
+    "username": "user",
+    "password": "geheimes passwort",
+    "bot_token": "token",
+    "chat_id": "1",
+    "host": "portal.example",
+    "start_time": "13:20",
+    "end_time": "17:30",
+}
+
+
+def _write_cron(path):
+    write_cron_file(path, "python", "-m src.cli", CRED_ARGS, "13:20", "17:30", 2, "1-5", "log", True)
+
+
+def test_next_fire_skips_weekend(tmp_path):
+    cron_file = tmp_path / "cron"
+    _write_cron(cron_file)
+    entries = parse_cron_entries(cron_file.read_text(encoding="utf-8"))
+    assert [entry.mode for entry in entries] == ["start", "stop"]
+
+    friday_evening = dt.datetime(2026, 10, 23, 18, 0)
+    snapshot = HealthState(tmp_path, cron_file).snapshot(friday_evening)
+    assert snapshot["next_runs"][0] == {"mode": "start", "at": "2026-10-26T13:17:00"}
+    assert snapshot["status"] == "ok"
+    assert "geheimes" not in json.dumps(snapshot)
+
+
+def test_failed_run_is_degraded_not_unhealthy(tmp_path):
+    cron_file = tmp_path / "cron"
+    _write_cron(cron_file)
+    (tmp_path / "last_run.json").write_text(
+        json.dumps({"mode": "stop", "success": False, "timings": {"login": 2.5}}), encoding="utf-8"
+    )
+
+    state = HealthState(tmp_path, cron_file)
+    snapshot = state.snapshot()
+    assert snapshot["status"] == "degraded"
+    assert snapshot["problems"] == []
+    metrics = state.metrics()
+    assert "cc_bot_healthy 1" in metrics
+    assert 'cc_bot_last_run_success{mode="stop"} 0' in metrics
+    assert 'cc_bot_last_run_phase_seconds{mode="stop",phase="login"} 2.5' in metrics
+
+    strict = HealthState(tmp_path, cron_file, fail_on_last_run=True)
+    assert strict.snapshot()["problems"] == ["letzter Lauf fehlgeschlagen"]
+
+
+def test_missing_cron_file(tmp_path):
+    snapshot = HealthState(tmp_path, tmp_path / "missing").snapshot()
+    assert snapshot["status"] == "error"
+    assert snapshot["last_run"] is None
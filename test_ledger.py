@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Tests des Status-Ledgers."""
+
+import datetime as dt
+
+from src.ledger import confirmed_mode, lookup, record_status
+
+NOW = dt.datetime(2026, 3, 2, 8, 30, 0)
+FRESHNESS = dt.timedelta(minutes=120)
+
+
+def test_confirmed_mode_requires_exactly_one_keyword():
+    assert confirmed_mode("Status: Kommen 08:01") == "start"
+    assert confirmed_mode("Status: Gehen 17:30") == "stop"
+    assert confirmed_mode("Kommen 08:01 / Gehen 17:30") is None
+    assert confirmed_mode("Status unbekannt") is None
+
+
+def test_lookup_matches_same_mode_within_freshness(tmp_path):
+    path = tmp_path / "ledger.json"
+    record_status(path, "Status: Kommen 08:01", now=NOW)
+
+    assert lookup(path, "start", FRESHNESS, now=NOW + dt.timedelta(minutes=30)) is not None
+    assert lookup(path, "stop", FRESHNESS, now=NOW + dt.timedelta(minutes=30)) is None
+    assert lookup(path, "start", FRESHNESS, now=NOW + dt.timedelta(minutes=121)) is None
+
+
+def test_lookup_ignores_previous_day(tmp_path):
+    path = tmp_path / "ledger.json"
+    late = dt.datetime(2026, 3, 1, 23, 50, 0)
+    record_status(path, "Status: Gehen 23:50", now=late)
+
+    assert lookup(path, "stop", FRESHNESS, now=late + dt.timedelta(minutes=20)) is None
+
+
+def test_unclear_status_is_not_recorded(tmp_path):
+    path = tmp_path / "ledger.json"
+    assert record_status(path, "Status unbekannt", now=NOW) is None
+    assert not path.exists()
+
+
+def test_unreadable_ledger_is_ignored(tmp_path):
+    path = tmp_path / "ledger.json"
+    path.write_text("{kaputt", encoding="utf-8")
+    assert lookup(path, "start", FRESHNESS, now=NOW) is None
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests der Telegram-Berichtsrichtlinien."""
+
+import datetime as dt
+
+from src.reporting import decide_report, remember_report
+
+NOW = dt.datetime(2026, 3, 2, 8, 30, 0)
+KOMMEN = "Status: Kommen 08:01"
+GEHEN = "Status: Gehen 17:30"
+
+
+def _decide(state, policy, success=True, status=KOMMEN, now=NOW, warning=False):
+    decision = decide_report(state, policy, success, status, now=now, warning=warning)
+    return decision.send, decision.photo
+
+
+def test_always_sends_photos_on_success_and_text_on_failure(tmp_path):
+    state = tmp_path / "report_state.json"
+    assert _decide(state, "always") == (True, True)
+    assert _decide(state, "always", success=False) == (True, False)
+
+
+def test_changes_sends_photo_only_for_first_run_and_transitions(tmp_path):
+    state = tmp_path / "report_state.json"
+    assert _decide(state, "changes") == (True, True)
+    remember_report(state, True, KOMMEN, photo_sent=True, now=NOW)
+
+    # Gleicher Status mit anderer Uhrzeit: nur Textzeile
+    later = NOW + dt.timedelta(minutes=5)
+    assert _decide(state, "changes", status="Status: Kommen 08:06", now=later) == (True, False)
+    assert _decide(state, "changes", status=GEHEN, now=later) == (True, True)
+    assert _decide(state, "changes", success=False, now=later) == (True, True)
+    assert _decide(state, "changes", now=later, warning=True) == (True, True)
+
+    # Neuer Tag: wieder ein Foto
+    assert _decide(state, "changes", now=NOW + dt.timedelta(days=1)) == (True, True)
+
+
+def test_quiet_skips_unchanged_runs(tmp_path):
+    state = tmp_path / "report_state.json"
+    remember_report(state, True, KOMMEN, photo_sent=True, now=NOW)
+
+    later = NOW + dt.timedelta(minutes=5)
+    assert _decide(state, "quiet", now=later) == (False, False)
+    assert _decide(state, "quiet", now=later, warning=True) == (True, True)
+    assert _decide(state, "quiet", success=False, now=later) == (True, True)
+
+
+def test_failure_does_not_change_remembered_state(tmp_path):
+    state = tmp_path / "report_state.json"
+    remember_report(state, True, KOMMEN, photo_sent=True, now=NOW)
+    remember_report(state, False, "Timeout", photo_sent=True, now=NOW)
+
+    later = NOW + dt.timedelta(minutes=5)
+    assert _decide(state, "changes", now=later) == (True, False)
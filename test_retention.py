@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Tests der Artefakt-Retention auf einem synthetischen Verzeichnis."""
+
+import datetime as dt
+import zipfile
+
+from src.retention import RetentionPolicy, apply_retention
+
+NOW = dt.datetime(2025, 6, 30, 12, 0, 0)
+RUNS = 3000
+
+
+def _make_runs(directory, count=RUNS, size=1000):
+    """Legt `count` Läufe (Screenshot + Run-Record) im Abstand von je 2 Stunden an."""
+    for index in range(count):
+        stamp = (NOW - dt.timedelta(hours=2 * index)).strftime("%Y%m%d_%H%M%S")
+        (directory / f"status_{stamp}.png").write_bytes(b"x" * size)
+        (directory / f"status_{stamp}.json").write_text("{}", encoding="utf-8")
+    (directory / "holidays_cache.json").write_text("[]", encoding="utf-8")
+
+
+def _runs(directory):
+    return sorted(path for path in directory.glob("status_*.png"))
+
+
+def test_dry_run_changes_nothing(tmp_path):
+    _make_runs(tmp_path)
+    before = sorted(tmp_path.iterdir())
+
+    result = apply_retention(tmp_path, RetentionPolicy(max_count=10, dry_run=True), now=NOW)
+
+    assert sorted(tmp_path.iterdir()) == before
+    assert len(result.deleted) == 2 * (RUNS - 10)
+
+
+def test_max_age_deletes_whole_runs(tmp_path):
+    _make_runs(tmp_path)
+
+    apply_retention(tmp_path, RetentionPolicy(max_age_days=30), now=NOW)
+
+    # 12 Läufe pro Tag über 30 Tage
+    assert len(_runs(tmp_path)) == 30 * 12
+    assert len(list(tmp_path.glob("status_*.json"))) == 30 * 12
+    assert (tmp_path / "holidays_cache.json").exists()
+
+
+def test_count_and_bytes_keep_newest(tmp_path):
+    _make_runs(tmp_path)
+
+    apply_retention(tmp_path, RetentionPolicy(max_count=500), now=NOW)
+    assert len(_runs(tmp_path)) == 500
+
+    apply_retention(tmp_path, RetentionPolicy(max_bytes=100 * 1002), now=NOW)
+    runs = _runs(tmp_path)
+    assert len(runs) == 100
+    assert runs[-1].name == f"status_{NOW.strftime('%Y%m%d_%H%M%S')}.png"
+
+
+def test_byte_limit_drops_everything_older_than_an_oversized_run(tmp_path):
+    _make_runs(tmp_path, count=10)
+    big = _runs(tmp_path)[-5]
+    big.write_bytes(b"x" * 50_000)
+
+    apply_retention(tmp_path, RetentionPolicy(max_bytes=20_000), now=NOW)
+
+    # Die vier neueren Läufe bleiben, der große und alle älteren entfallen
+    runs = _runs(tmp_path)
+    assert len(runs) == 4
+    assert big not in runs
+
+
+def test_archive_moves_old_runs_into_monthly_zip(tmp_path):
+    _make_runs(tmp_path, count=1200)
+
+    result = apply_retention(tmp_path, RetentionPolicy(archive_after_days=14), now=NOW)
+
+    assert len(_runs(tmp_path)) == 14 * 12
+    archives = sorted(tmp_path.glob("status_??????.zip"))
+    assert [path.name for path in archives] == [
+        "status_202503.zip",
+        "status_202504.zip",
+        "status_202505.zip",
+        "status_202506.zip",
+    ]
+    archived_names = set()
+    for path in archives:
+        with zipfile.ZipFile(path) as archive:
+            archived_names.update(archive.namelist())
+    assert len(archived_names) == len(result.archived) == 2 * (1200 - 14 * 12)
+
+    # Ein späterer Lauf entfernt abgelaufene Monatsarchive vollständig
+    apply_retention(tmp_path, RetentionPolicy(max_age_days=45), now=NOW)
+    assert sorted(path.name for path in tmp_path.glob("status_??????.zip")) == [
+        "status_202505.zip",
+        "status_202506.zip",
+    ]
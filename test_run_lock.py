@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Tests der Laufsperre (wait, skip, queue und veraltete Sperren)."""
+
+import asyncio
+import json
+import logging
+
+from src.cli import RunLock
+
+POLL = 0.05
+
+
+def _lock(tmp_path, policy, timeout=5.0):
+    return RunLock(tmp_path / "run.lock", policy, timeout, poll_interval=POLL)
+
+
+def test_skip_policy_gives_up_immediately(tmp_path):
+    async def scenario():
+        holder = _lock(tmp_path, "skip")
+        assert await holder.acquire("start")
+        other = _lock(tmp_path, "skip")
+        assert not await other.acquire("stop")
+        assert other.wait_seconds < 0.5
+        holder.release()
+        assert await other.acquire("stop")
+        other.release()
+
+    asyncio.run(scenario())
+
+
+def test_wait_policy_times_out_and_records_wait(tmp_path):
+    async def scenario():
+        holder = _lock(tmp_path, "skip")
+        assert await holder.acquire("start")
+        assert not await _lock(tmp_path, "wait", timeout=0.2).acquire("stop")
+
+        waiter = _lock(tmp_path, "wait", timeout=5.0)
+        task = asyncio.create_task(waiter.acquire("stop"))
+        await asyncio.sleep(0.3)
+        holder.release()
+        assert await task
+        assert 0.3 <= waiter.wait_seconds < 1.0
+        assert json.loads((tmp_path / "run.lock").read_text(encoding="utf-8"))["mode"] == "stop"
+        waiter.release()
+
+    asyncio.run(scenario())
+
+
+def test_queue_policy_allows_a_single_waiter(tmp_path):
+    async def scenario():
+        holder = _lock(tmp_path, "skip")
+        assert await holder.acquire("start")
+        first = _lock(tmp_path, "queue")
+        queued = asyncio.create_task(first.acquire("stop"))
+        await asyncio.sleep(0.2)
+
+        # Der Warteplatz ist belegt: ein weiterer Lauf entfällt sofort
+        assert not await _lock(tmp_path, "queue").acquire("stop")
+
+        holder.release()
+        assert await queued
+        first.release()
+        # Nach dem Durchlauf ist der Warteplatz wieder frei
+        assert await _lock(tmp_path, "queue").acquire("start")
+
+    asyncio.run(scenario())
+
+
+def test_stale_holder_is_detected_and_release_clears_it(tmp_path, caplog):
+    lock_path = tmp_path / "run.lock"
+    lock_path.write_text(json.dumps({"pid": 999999, "mode": "start"}), encoding="utf-8")
+
+    async def scenario():
+        lock = _lock(tmp_path, "skip")
+        with caplog.at_level(logging.WARNING):
+            assert await lock.acquire("stop")
+        assert "Veraltete Sperre" in caplog.text
+        assert json.loads(lock_path.read_text(encoding="utf-8"))["mode"] == "stop"
+        lock.release()
+
+    asyncio.run(scenario())
+    # Sauber beendete Läufe hinterlassen eine leere Sperrdatei
+    assert lock_path.read_text(encoding="utf-8") == ""
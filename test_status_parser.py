@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""Tests des Statusparsers für Navigationsantworten."""
+
+from src.status_parser import parse_status
+
+
+def test_scope_order_beats_document_order():
+    html = """
+    <p>Zuletzt: Gehen gestern</p>
+    <div class="zeiterfassung"><p>Status: Gehen 17:30</p></div>
+    <div id="zeiterfassungdetailscontainer"><p>Status: Kommen 08:01</p></div>
+    """
+    assert parse_status(html) == "Status: Kommen 08:01"
+
+
+def test_first_paragraph_per_scope_only():
+    # Wie `locator(...).first`: der erste <p> im Scope zählt, auch ohne Schlüsselwort
+    html = """
+    <div id="zeiterfassungdetailscontainer"><p>Keine Buchung</p><p>Kommen 08:01</p></div>
+    <div id="status"><p>Gehen 17:30</p></div>
+    """
+    assert parse_status(html) == "Gehen 17:30"
+
+
+def test_unclosed_paragraph_and_br():
+    html = '<div id="status"><p>Status:<br>Kommen<br/>08:01<p>Andere Zeile</div>'
+    assert parse_status(html) == "Status: Kommen 08:01"
+
+
+def test_entities_are_decoded():
+    html = "<div class='zeiterfassung'><p>Gehen&nbsp;17:30 &ndash; sch&ouml;nen Abend</p></div>"
+    assert parse_status(html) == "Gehen 17:30 – schönen Abend"
+
+
+def test_no_status():
+    assert parse_status("<html><body><p>Anmeldung erforderlich</p></body></html>") is None
+    assert parse_status("") is None